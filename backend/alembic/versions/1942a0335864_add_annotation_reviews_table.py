@@ -33,16 +33,21 @@ def upgrade() -> None:
     sa.PrimaryKeyConstraint('id'),
     sa.UniqueConstraint('annotation_id', 'reviewer_id', name='unique_annotation_reviewer')
     )
-    op.create_index(op.f('ix_annotation_reviews_annotation_id'), 'annotation_reviews', ['annotation_id'], unique=False)
-    op.create_index(op.f('ix_annotation_reviews_id'), 'annotation_reviews', ['id'], unique=False)
-    op.create_index(op.f('ix_annotation_reviews_reviewer_id'), 'annotation_reviews', ['reviewer_id'], unique=False)
     # ### end Alembic commands ###
 
+    # Build indexes outside the migration transaction so writers are not blocked
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_annotation_reviews_annotation_id ON annotation_reviews (annotation_id)")
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_annotation_reviews_id ON annotation_reviews (id)")
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_annotation_reviews_reviewer_id ON annotation_reviews (reviewer_id)")
+
 
 def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_annotation_reviews_reviewer_id")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_annotation_reviews_id")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_annotation_reviews_annotation_id")
+
     # ### commands auto generated by Alembic - please adjust! ###
-    op.drop_index(op.f('ix_annotation_reviews_reviewer_id'), table_name='annotation_reviews')
-    op.drop_index(op.f('ix_annotation_reviews_id'), table_name='annotation_reviews')
-    op.drop_index(op.f('ix_annotation_reviews_annotation_id'), table_name='annotation_reviews')
     op.drop_table('annotation_reviews')
     # ### end Alembic commands ###
@@ -35,18 +35,9 @@ def upgrade() -> None:
     sa.ForeignKeyConstraint(['parent_id'], ['annotation_list.id'], ondelete='CASCADE'),
     sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_annotation_list_id'), 'annotation_list', ['id'], unique=False)
-    op.create_index(op.f('ix_annotation_list_type'), 'annotation_list', ['type'], unique=False)
-    op.create_index(op.f('ix_annotation_list_parent_id'), 'annotation_list', ['parent_id'], unique=False)
-    op.create_index(op.f('ix_annotation_list_created_by'), 'annotation_list', ['created_by'], unique=False)
+    # Secondary indexes are built in c7d8e9f0a1b2, after any data is loaded
 
 
 def downgrade() -> None:
-    # Drop indexes
-    op.drop_index(op.f('ix_annotation_list_created_by'), table_name='annotation_list')
-    op.drop_index(op.f('ix_annotation_list_parent_id'), table_name='annotation_list')
-    op.drop_index(op.f('ix_annotation_list_type'), table_name='annotation_list')
-    op.drop_index(op.f('ix_annotation_list_id'), table_name='annotation_list')
-    
     # Drop table
     op.drop_table('annotation_list')
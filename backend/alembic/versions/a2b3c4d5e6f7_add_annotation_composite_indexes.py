@@ -0,0 +1,41 @@
+"""add_annotation_composite_indexes
+
+Revision ID: a2b3c4d5e6f7
+Revises: f7a8b9c0d1e2
+Create Date: 2026-03-10 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a2b3c4d5e6f7'
+down_revision: Union[str, None] = 'f7a8b9c0d1e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # (filter column, id) pairs let filtered listings walk the index in id order
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_annotations_text_id_id ON annotations (text_id, id)")
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_annotations_annotator_id_id ON annotations (annotator_id, id)")
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_annotations_annotation_type_id ON annotations (annotation_type, id)")
+        # The composites lead with the same columns and serve every lookup the
+        # single-column indexes did, including the foreign-key checks
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_annotations_text_id")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_annotations_annotator_id")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_annotations_annotation_type")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_annotations_annotation_type ON annotations (annotation_type)")
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_annotations_annotator_id ON annotations (annotator_id)")
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_annotations_text_id ON annotations (text_id)")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_annotations_annotation_type_id")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_annotations_annotator_id_id")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_annotations_text_id_id")
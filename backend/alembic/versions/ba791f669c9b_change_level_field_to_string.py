@@ -18,12 +18,52 @@ branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
 
+BACKFILL_BATCH_SIZE = 10_000
+
+
 def upgrade() -> None:
-    # Step 1: Change the column type from enum to string
-    # We need to cast the enum values to string
-    op.execute("ALTER TABLE annotations ALTER COLUMN level TYPE varchar USING level::text")
-    
-    # Step 2: Drop the enum type since it's no longer used
+    # Step 1: Add a varchar column next to the enum one (metadata-only change)
+    op.add_column('annotations', sa.Column('level_new', sa.String(), nullable=True))
+
+    # Mirror writes into the new column while the backfill runs, so rows inserted
+    # or updated by the application during the migration are not missed
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION sync_annotations_level_new() RETURNS trigger AS $$
+        BEGIN
+            NEW.level_new := NEW.level::text;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER annotations_sync_level_new "
+        "BEFORE INSERT OR UPDATE ON annotations "
+        "FOR EACH ROW EXECUTE FUNCTION sync_annotations_level_new()"
+    )
+
+    # Step 2: Copy the enum values across in id ranges, committing each batch so
+    # no single statement rewrites the whole table under one lock
+    connection = op.get_bind()
+    bounds = connection.execute(sa.text("SELECT min(id), max(id) FROM annotations")).first()
+    if bounds is not None and bounds[0] is not None:
+        low, high = bounds
+        with op.get_context().autocommit_block():
+            for batch_start in range(low, high + 1, BACKFILL_BATCH_SIZE):
+                connection.execute(
+                    sa.text(
+                        "UPDATE annotations SET level_new = level::text "
+                        "WHERE id >= :lo AND id < :hi AND level IS NOT NULL"
+                    ),
+                    {"lo": batch_start, "hi": batch_start + BACKFILL_BATCH_SIZE},
+                )
+
+    # Step 3: Swap the columns and drop the enum type, which only needs a brief lock
+    op.execute("DROP TRIGGER IF EXISTS annotations_sync_level_new ON annotations")
+    op.execute("DROP FUNCTION IF EXISTS sync_annotations_level_new()")
+    op.execute("ALTER TABLE annotations DROP COLUMN level")
+    op.execute("ALTER TABLE annotations RENAME COLUMN level_new TO level")
     op.execute("DROP TYPE IF EXISTS annotation_level")
 
 
@@ -0,0 +1,35 @@
+"""add_annotation_list_indexes
+
+Revision ID: c7d8e9f0a1b2
+Revises: 487e729d5cef
+Create Date: 2025-10-07 10:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d8e9f0a1b2'
+down_revision: Union[str, None] = '487e729d5cef'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Build indexes outside the migration transaction so writers are not blocked
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_annotation_list_id ON annotation_list (id)")
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_annotation_list_type ON annotation_list (type)")
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_annotation_list_parent_id ON annotation_list (parent_id)")
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_annotation_list_created_by ON annotation_list (created_by)")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_annotation_list_created_by")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_annotation_list_parent_id")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_annotation_list_type")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_annotation_list_id")
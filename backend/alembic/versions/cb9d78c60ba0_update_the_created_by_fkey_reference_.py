@@ -1,7 +1,7 @@
 """update the created_by fkey reference column
 
 Revision ID: cb9d78c60ba0
-Revises: 487e729d5cef
+Revises: c7d8e9f0a1b2
 Create Date: 2025-10-07 11:27:38.025242
 
 """
@@ -13,28 +13,107 @@ import sqlalchemy as sa
 
 # revision identifiers, used by Alembic.
 revision: str = 'cb9d78c60ba0'
-down_revision: Union[str, None] = '487e729d5cef'
+down_revision: Union[str, None] = 'c7d8e9f0a1b2'
 branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
 
+BACKFILL_BATCH_SIZE = 5_000
+
+
+def _backfill(update_sql: str) -> None:
+    """Run update_sql (restricted by :ids) over annotation_list in keyset batches, each committed on its own."""
+    connection = op.get_bind()
+    last_id = ""
+    while True:
+        batch_ids = [
+            row[0] for row in connection.execute(
+                sa.text(
+                    "SELECT id FROM annotation_list WHERE id > :last_id "
+                    "ORDER BY id LIMIT :batch_size"
+                ),
+                {"last_id": last_id, "batch_size": BACKFILL_BATCH_SIZE},
+            )
+        ]
+        if not batch_ids:
+            break
+        connection.execute(sa.text(update_sql), {"ids": batch_ids})
+        last_id = batch_ids[-1]
+
+
 def upgrade() -> None:
-    # ### commands auto generated by Alembic - please adjust! ###
     op.drop_constraint(op.f('annotation_list_created_by_fkey'), 'annotation_list', type_='foreignkey')
-    op.alter_column('annotation_list', 'created_by',
-               existing_type=sa.INTEGER(),
-               type_=sa.String(),
-               existing_nullable=True)
-    op.create_foreign_key(None, 'annotation_list', 'users', ['created_by'], ['auth0_user_id'])
-    # ### end Alembic commands ###
+
+    # Build the string column alongside the integer one instead of rewriting
+    # the table in place with ALTER COLUMN ... TYPE
+    op.add_column('annotation_list', sa.Column('created_by_str', sa.String(), nullable=True))
+
+    with op.get_context().autocommit_block():
+        _backfill(
+            "UPDATE annotation_list SET created_by_str = users.auth0_user_id "
+            "FROM users "
+            "WHERE annotation_list.created_by = users.id "
+            "AND annotation_list.id = ANY(:ids)"
+        )
+
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS tmp_ix_al_cb_str "
+            "ON annotation_list (created_by_str)"
+        )
+
+    # Short swap: catch up rows written during the backfill, replace the column
+    # and attach the foreign key without scanning the table
+    op.execute(
+        "UPDATE annotation_list SET created_by_str = users.auth0_user_id "
+        "FROM users "
+        "WHERE annotation_list.created_by = users.id "
+        "AND annotation_list.created_by_str IS NULL"
+    )
+    op.drop_column('annotation_list', 'created_by')
+    op.alter_column('annotation_list', 'created_by_str', new_column_name='created_by')
+    op.execute("ALTER INDEX tmp_ix_al_cb_str RENAME TO ix_annotation_list_created_by")
+    op.execute(
+        "ALTER TABLE annotation_list ADD CONSTRAINT annotation_list_created_by_fkey "
+        "FOREIGN KEY (created_by) REFERENCES users (auth0_user_id) NOT VALID"
+    )
+
+    # Validation only takes a SHARE UPDATE EXCLUSIVE lock, so writes keep flowing
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TABLE annotation_list VALIDATE CONSTRAINT annotation_list_created_by_fkey")
 
 
 def downgrade() -> None:
-    # ### commands auto generated by Alembic - please adjust! ###
-    op.drop_constraint(None, 'annotation_list', type_='foreignkey')
-    op.alter_column('annotation_list', 'created_by',
-               existing_type=sa.String(),
-               type_=sa.INTEGER(),
-               existing_nullable=True)
-    op.create_foreign_key(op.f('annotation_list_created_by_fkey'), 'annotation_list', 'users', ['created_by'], ['id'])
-    # ### end Alembic commands ###
+    # Reverse of upgrade: map auth0 ids back to users.id through an integer
+    # shadow column, then swap it in
+    op.drop_constraint('annotation_list_created_by_fkey', 'annotation_list', type_='foreignkey')
+    op.add_column('annotation_list', sa.Column('created_by_int', sa.Integer(), nullable=True))
+
+    with op.get_context().autocommit_block():
+        _backfill(
+            "UPDATE annotation_list SET created_by_int = users.id "
+            "FROM users "
+            "WHERE annotation_list.created_by = users.auth0_user_id "
+            "AND annotation_list.id = ANY(:ids)"
+        )
+
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS tmp_ix_al_cb_int "
+            "ON annotation_list (created_by_int)"
+        )
+
+    op.execute(
+        "UPDATE annotation_list SET created_by_int = users.id "
+        "FROM users "
+        "WHERE annotation_list.created_by = users.auth0_user_id "
+        "AND annotation_list.created_by_int IS NULL"
+    )
+    op.drop_column('annotation_list', 'created_by')
+    op.alter_column('annotation_list', 'created_by_int', new_column_name='created_by')
+    op.execute("ALTER INDEX tmp_ix_al_cb_int RENAME TO ix_annotation_list_created_by")
+    op.execute(
+        "ALTER TABLE annotation_list ADD CONSTRAINT annotation_list_created_by_fkey "
+        "FOREIGN KEY (created_by) REFERENCES users (id) NOT VALID"
+    )
+
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TABLE annotation_list VALIDATE CONSTRAINT annotation_list_created_by_fkey")
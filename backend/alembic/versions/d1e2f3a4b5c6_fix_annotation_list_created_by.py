@@ -22,30 +22,21 @@ def upgrade() -> None:
     # Drop the old foreign key constraint
     op.drop_constraint('annotation_list_created_by_fkey', 'annotation_list', type_='foreignkey')
     
-    # Alter the column type to String
-    op.alter_column('annotation_list', 'created_by',
-                    existing_type=sa.Integer(),
-                    type_=sa.String(),
-                    existing_nullable=True)
+    # created_by is already a String column at this point (cb9d78c60ba0
+    # swapped it in), so there is no type change to make here.
     
-    # Add the new foreign key constraint to users.auth0_user_id
-    op.create_foreign_key('annotation_list_created_by_fkey', 
-                         'annotation_list', 'users',
-                         ['created_by'], ['auth0_user_id'])
+    # Add the new foreign key constraint to users.auth0_user_id without scanning
+    # the table, then validate it outside the transaction
+    op.execute(
+        "ALTER TABLE annotation_list ADD CONSTRAINT annotation_list_created_by_fkey "
+        "FOREIGN KEY (created_by) REFERENCES users (auth0_user_id) NOT VALID"
+    )
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TABLE annotation_list VALIDATE CONSTRAINT annotation_list_created_by_fkey")
 
 
 def downgrade() -> None:
-    # Drop the new foreign key constraint
-    op.drop_constraint('annotation_list_created_by_fkey', 'annotation_list', type_='foreignkey')
-    
-    # Alter the column type back to Integer
-    op.alter_column('annotation_list', 'created_by',
-                    existing_type=sa.String(),
-                    type_=sa.Integer(),
-                    existing_nullable=True)
-    
-    # Add back the old foreign key constraint to users.id
-    op.create_foreign_key('annotation_list_created_by_fkey',
-                         'annotation_list', 'users',
-                         ['created_by'], ['id'])
-
+    # upgrade only re-creates the constraint cb9d78c60ba0 already added, so the
+    # column and its foreign key to users.auth0_user_id stay as they are; the
+    # type change back to Integer belongs to cb9d78c60ba0's downgrade
+    pass
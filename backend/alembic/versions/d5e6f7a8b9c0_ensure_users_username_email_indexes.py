@@ -0,0 +1,39 @@
+"""ensure_users_username_email_indexes
+
+Revision ID: d5e6f7a8b9c0
+Revises: b3c4d5e6f7a8
+Create Date: 2026-03-20 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5e6f7a8b9c0'
+down_revision: Union[str, None] = 'b3c4d5e6f7a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # User updates rely on these unique indexes (not pre-check SELECTs) to
+    # reject taken usernames and emails; the users table is created by
+    # metadata.create_all, so make sure they exist under the model's names.
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ix_users_username "
+            "ON users (username)"
+        )
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ix_users_email "
+            "ON users (email)"
+        )
+
+
+def downgrade() -> None:
+    # The indexes predate this revision on databases created through
+    # metadata.create_all, so they are left in place.
+    pass
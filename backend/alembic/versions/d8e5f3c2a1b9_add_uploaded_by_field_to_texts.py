@@ -19,17 +19,16 @@ depends_on: Union[str, Sequence[str], None] = None
 
 
 def upgrade() -> None:
-    # Add uploaded_by column to texts table
-    op.add_column('texts', 
-        sa.Column('uploaded_by', sa.Integer(), nullable=True)
-    )
-    
-    # Add foreign key constraint
-    op.create_foreign_key(
-        'fk_texts_uploaded_by_users',
-        'texts', 'users',
-        ['uploaded_by'], ['id']
+    # Add uploaded_by and its foreign key in a single ALTER TABLE so texts is
+    # locked once; NOT VALID skips the scan, which is done online afterwards
+    op.execute(
+        "ALTER TABLE texts "
+        "ADD COLUMN uploaded_by integer, "
+        "ADD CONSTRAINT fk_texts_uploaded_by_users "
+        "FOREIGN KEY (uploaded_by) REFERENCES users (id) NOT VALID"
     )
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TABLE texts VALIDATE CONSTRAINT fk_texts_uploaded_by_users")
 
 
 def downgrade() -> None:
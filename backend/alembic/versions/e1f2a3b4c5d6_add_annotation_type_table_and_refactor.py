@@ -9,7 +9,6 @@ from typing import Sequence, Union
 from alembic import op
 import sqlalchemy as sa
 from sqlalchemy.dialects import postgresql
-import uuid
 
 # revision identifiers, used by Alembic.
 revision: str = 'e1f2a3b4c5d6'
@@ -18,7 +17,29 @@ branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
 
+BACKFILL_BATCH_SIZE = 5_000
+
+
+def _index_exists(connection: sa.engine.Connection, index_name: str) -> bool:
+    result = connection.execute(
+        sa.text(
+            "SELECT 1 FROM pg_indexes WHERE indexname = :index_name"
+        ),
+        {"index_name": index_name},
+    )
+    return result.scalar() is not None
+
+
 def upgrade() -> None:
+    # gen_random_uuid() is used to mint annotation_type ids server-side
+    op.execute("CREATE EXTENSION IF NOT EXISTS pgcrypto")
+
+    # Index annotation_list.type for the duration of the backfill so the
+    # type_id join below is an index lookup rather than a sequential scan.
+    # Databases that already carry ix_annotation_list_type reuse that one.
+    if not _index_exists(op.get_bind(), "ix_annotation_list_type"):
+        op.execute("CREATE INDEX IF NOT EXISTS tmp_ix_al_type ON annotation_list (type)")
+
     # Step 1: Create the annotation_type table
     op.create_table(
         'annotation_type',
@@ -35,53 +56,70 @@ def upgrade() -> None:
     op.create_index(op.f('ix_annotation_type_name'), 'annotation_type', ['name'], unique=True)
 
     # Step 2: Extract unique types from annotation_list and populate annotation_type
-    # This is done using raw SQL to handle data migration
-    connection = op.get_bind()
-    
-    # Get distinct types from annotation_list
-    result = connection.execute(
-        sa.text("SELECT DISTINCT type FROM annotation_list WHERE type IS NOT NULL")
-    )
-    unique_types = [row[0] for row in result]
-    
-    # Create a mapping of type names to new UUIDs
-    type_id_mapping = {}
-    for type_name in unique_types:
-        new_id = str(uuid.uuid4())
-        type_id_mapping[type_name] = new_id
-        
-        # Insert into annotation_type table
-        connection.execute(
-            sa.text(
-                "INSERT INTO annotation_type (id, name, created_at) "
-                "VALUES (:id, :name, now())"
-            ),
-            {"id": new_id, "name": type_name}
+    # in a single set-based statement, generating ids server-side
+    with op.get_context().autocommit_block():
+        op.execute(
+            """
+            INSERT INTO annotation_type (id, name, created_at)
+            SELECT gen_random_uuid()::text, t.type, now()
+            FROM (SELECT DISTINCT type FROM annotation_list WHERE type IS NOT NULL) t
+            """
         )
     
-    # Step 3: Add type_id column to annotation_list (nullable initially)
+    # Step 3: Add type_id column to annotation_list (nullable initially); its index
+    # is built after the backfill so the UPDATEs do not pay for index maintenance
     op.add_column('annotation_list', sa.Column('type_id', sa.String(), nullable=True))
-    op.create_index(op.f('ix_annotation_list_type_id'), 'annotation_list', ['type_id'], unique=False)
     
-    # Step 4: Populate type_id based on existing type values
-    for type_name, type_id in type_id_mapping.items():
-        connection.execute(
-            sa.text(
-                "UPDATE annotation_list SET type_id = :type_id WHERE type = :type_name"
-            ),
-            {"type_id": type_id, "type_name": type_name}
+    # Step 4: Populate type_id with a join update instead of one UPDATE per type,
+    # committing each keyset batch so locks and dead tuples do not pile up;
+    # rows that already carry a type_id are left alone so the step can be re-run
+    connection = op.get_bind()
+    with op.get_context().autocommit_block():
+        last_id = ""
+        while True:
+            batch_ids = [
+                row[0] for row in connection.execute(
+                    sa.text(
+                        "SELECT id FROM annotation_list WHERE id > :last_id "
+                        "ORDER BY id LIMIT :batch_size"
+                    ),
+                    {"last_id": last_id, "batch_size": BACKFILL_BATCH_SIZE},
+                )
+            ]
+            if not batch_ids:
+                break
+            connection.execute(
+                sa.text(
+                    """
+                    UPDATE annotation_list al
+                    SET type_id = at.id
+                    FROM annotation_type at
+                    WHERE al.type = at.name
+                      AND al.type_id IS NULL
+                      AND al.id = ANY(:ids)
+                    """
+                ),
+                {"ids": batch_ids},
+            )
+            last_id = batch_ids[-1]
+
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_annotation_list_type_id "
+            "ON annotation_list (type_id)"
         )
     
-    # Step 5: Add foreign key constraint to type_id
-    op.create_foreign_key(
-        'fk_annotation_list_type_id',
-        'annotation_list', 'annotation_type',
-        ['type_id'], ['id'],
-        ondelete='CASCADE'
+    # Step 5: Add foreign key constraint to type_id without scanning the table,
+    # then validate it outside the transaction so writes are not blocked
+    op.execute(
+        "ALTER TABLE annotation_list ADD CONSTRAINT fk_annotation_list_type_id "
+        "FOREIGN KEY (type_id) REFERENCES annotation_type (id) ON DELETE CASCADE NOT VALID"
     )
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TABLE annotation_list VALIDATE CONSTRAINT fk_annotation_list_type_id")
     
-    # Step 6: Drop the old type column and its index
-    op.drop_index('ix_annotation_list_type', table_name='annotation_list')
+    # Step 6: Drop the old type column and its indexes
+    op.execute("DROP INDEX IF EXISTS tmp_ix_al_type")
+    op.execute("DROP INDEX IF EXISTS ix_annotation_list_type")
     op.drop_column('annotation_list', 'type')
 
 
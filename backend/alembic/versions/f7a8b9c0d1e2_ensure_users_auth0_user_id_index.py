@@ -0,0 +1,36 @@
+"""ensure_users_auth0_user_id_index
+
+Revision ID: f7a8b9c0d1e2
+Revises: b2c3d4e5f6a7
+Create Date: 2026-03-10 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7a8b9c0d1e2'
+down_revision: Union[str, None] = 'b2c3d4e5f6a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Every authenticated request looks users up by auth0_user_id. The users
+    # table is created by metadata.create_all rather than a migration, so make
+    # sure the unique index the model declares actually exists.
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ix_users_auth0_user_id "
+            "ON users (auth0_user_id)"
+        )
+
+
+def downgrade() -> None:
+    # Foreign keys on annotation_list.created_by and annotation_type.uploader_id
+    # depend on this index, and it predates this revision on databases created
+    # through metadata.create_all, so it is left in place.
+    pass
@@ -7,127 +7,183 @@ It handles all HTTP requests, error handling, and data transformation for OpenPe
 Equivalent to the original JavaScript: apis/openpecha_api.js
 """
 
+import asyncio
+import functools
 import os
 from typing import List, Optional, Dict, Any
 from fastapi import HTTPException, status
 import httpx
+import orjson
 from dotenv import load_dotenv
 
+from utils.ttl_cache import TTLCache
+
 # Load environment variables
 load_dotenv()
 
 # Get the OpenPecha API endpoint from environment
 OPENPECHA_ENDPOINT = os.getenv("OPENPECHA_ENDPOINT", "")
 
+# How long responses (expressions, expression instances, instance texts) are cached
+OPENPECHA_CACHE_TTL = float(os.getenv("OPENPECHA_CACHE_TTL", "300"))
+
+
+# ============================================================================
+# Shared HTTP Client
+# ============================================================================
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+async def _raise_for_status(response: httpx.Response) -> None:
+    """Response hook: fail fast on 4xx/5xx before the caller decodes the body."""
+    if response.is_error:
+        await response.aread()
+        response.raise_for_status()
+
+
+async def get_client() -> httpx.AsyncClient:
+    """
+    Return the process-wide OpenPecha client, creating it on first use.
+
+    Reusing one client keeps connections alive across requests instead of
+    paying for a new TCP/TLS handshake and connection pool on every call.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(30.0),
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=128),
+            headers={
+                "accept": "application/json",
+                "Content-Type": "application/json",
+            },
+            event_hooks={"response": [_raise_for_status]},
+        )
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared client; called on application shutdown."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+# ============================================================================
+# Response Cache
+# ============================================================================
+
+class _ResponseCache:
+    """Bounded in-process TTL cache of decoded response bodies, keyed by URL."""
+
+    def __init__(self, max_entries: int):
+        self._cache = TTLCache(ttl=OPENPECHA_CACHE_TTL, max_entries=max_entries)
+
+    def get(self, url: str) -> Optional[Any]:
+        """Return a cached response body for url if it has not expired."""
+        return self._cache.get(url)
+
+    def set(self, url: str, response: httpx.Response, data: Any) -> None:
+        """Cache a response body unless caching is disabled or the server forbids it."""
+        if "no-store" in response.headers.get("cache-control", "").lower():
+            return
+        self._cache.set(url, data)
+
+
+# Catalog listings are small; instance texts can be large, so keep fewer of them
+_catalog_cache = _ResponseCache(max_entries=1024)
+_text_cache = _ResponseCache(max_entries=128)
+
+
+# ============================================================================
+# Request Helpers
+# ============================================================================
+
+def _openpecha_call(failure_message: str):
+    """
+    Decorator that checks the endpoint is configured and maps httpx errors
+    to HTTPExceptions, so each API function only has to build its URL.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if not OPENPECHA_ENDPOINT:
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail="OPENPECHA_ENDPOINT is not configured"
+                )
+            try:
+                return await func(*args, **kwargs)
+            except httpx.HTTPStatusError as e:
+                raise HTTPException(
+                    status_code=e.response.status_code,
+                    detail=f"{failure_message}: {e.response.text}"
+                )
+            except httpx.RequestError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail=f"Failed to connect to OpenPecha API: {str(e)}"
+                )
+        return wrapper
+    return decorator
+
+
+async def _get_json(url: str, cache: Optional[_ResponseCache] = None) -> Any:
+    """GET url on the shared client and decode the JSON body, optionally cached."""
+    if cache is not None:
+        cached = cache.get(url)
+        if cached is not None:
+            return cached
+
+    client = await get_client()
+    response = await client.get(url)
+    data = orjson.loads(response.content)
+    if cache is not None:
+        cache.set(url, response, data)
+    return data
+
 
 # ============================================================================
 # Main API Functions
 # ============================================================================
 
+@_openpecha_call("Failed to fetch expressions")
 async def get_expressions(expression_type: Optional[str] = None) -> List[Dict[str, Any]]:
     """
     Fetch list of expressions from OpenPecha API.
     """
-    if not OPENPECHA_ENDPOINT:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="OPENPECHA_ENDPOINT is not configured"
-        )
-    
     url = f"{OPENPECHA_ENDPOINT}/texts"
     if expression_type:
         url += f"?type={expression_type}"
-    
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(
-                url,
-                headers={
-                    "accept": "application/json",
-                    "Content-Type": "application/json",
-                },
-                timeout=30.0
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            raise HTTPException(
-                status_code=e.response.status_code,
-                detail=f"Failed to fetch expressions: {e.response.text}"
-            )
-        except httpx.RequestError as e:
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail=f"Failed to connect to OpenPecha API: {str(e)}"
-            )
+    return await _get_json(url, cache=_catalog_cache)
 
 
+@_openpecha_call("Failed to fetch text instances")
 async def get_expression_texts(text_id: str) -> List[Dict[str, Any]]:
     """
     Get list of available manifestations/instances for an expression.
     """
-    if not OPENPECHA_ENDPOINT:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="OPENPECHA_ENDPOINT is not configured"
-        )
-    
-    url = f"{OPENPECHA_ENDPOINT}/texts/{text_id}/instances"
-    
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(
-                url,
-                headers={
-                    "accept": "application/json",
-                    "Content-Type": "application/json",
-                },
-                timeout=30.0
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            raise HTTPException(
-                status_code=e.response.status_code,
-                detail=f"Failed to fetch text instances: {e.response.text}"
-            )
-        except httpx.RequestError as e:
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail=f"Failed to connect to OpenPecha API: {str(e)}"
-            )
+    return await _get_json(f"{OPENPECHA_ENDPOINT}/texts/{text_id}/instances", cache=_catalog_cache)
 
 
+@_openpecha_call("Failed to fetch instance text")
 async def get_text(instance_id: str) -> Dict[str, Any]:
     """
     Fetch serialized text for translation.
     """
-    if not OPENPECHA_ENDPOINT:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="OPENPECHA_ENDPOINT is not configured"
-        )
-    
-    url = f"{OPENPECHA_ENDPOINT}/instances/{instance_id}"
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(
-                url,
-                headers={
-                    "accept": "application/json",
-                    "Content-Type": "application/json",
-                },
-                timeout=30.0
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            raise HTTPException(
-                status_code=e.response.status_code,
-                detail=f"Failed to fetch instance text: {e.response.text}"
-            )
-        except httpx.RequestError as e:
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail=f"Failed to connect to OpenPecha API: {str(e)}"
-            )
+    return await _get_json(f"{OPENPECHA_ENDPOINT}/instances/{instance_id}", cache=_text_cache)
+
+
+async def get_texts(instance_ids: List[str], concurrency: int = 16) -> List[Dict[str, Any]]:
+    """
+    Fetch several instance texts concurrently, preserving the order of instance_ids.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _fetch(instance_id: str) -> Dict[str, Any]:
+        async with semaphore:
+            return await get_text(instance_id)
+
+    return await asyncio.gather(*(_fetch(instance_id) for instance_id in instance_ids))
@@ -1,22 +1,34 @@
-import json
+import asyncio
+import hashlib
+import logging
 import jwt
-import requests
-from typing import Optional, Dict, Any
+import httpx
+from jwt.utils import base64url_decode
+from cryptography.hazmat.primitives.asymmetric.rsa import RSAPublicKey, RSAPublicNumbers
+from typing import Optional, Dict, Any, Tuple
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, make_transient_to_detached
 from deps import get_db
 from models.user import User, UserRole
+from utils.ttl_cache import TTLCache
+from utils.user_cache import get_cached_user, cache_user
 import os
-from functools import lru_cache
+import threading
+import time
 
 # Auth0 configuration
 AUTH0_DOMAIN = os.getenv("AUTH0_DOMAIN")
 AUTH0_AUDIENCE = os.getenv("AUTH0_AUDIENCE")  # Changed from AUTH0_API_AUDIENCE to match Node.js
 AUTH0_ALGORITHMS = ["RS256"]
+AUTH0_ISSUER = f"https://{AUTH0_DOMAIN}/"
+AUTH0_CACHE_TTL = float(os.getenv("AUTH0_CACHE_TTL", "600"))
+AUTH0_REQUEST_TIMEOUT = float(os.getenv("AUTH0_REQUEST_TIMEOUT", "10"))
 
 security = HTTPBearer()
 
+logger = logging.getLogger(__name__)
+
 
 class Auth0JWKSError(Exception):
     """Exception raised for Auth0 JWKS errors."""
@@ -28,73 +40,219 @@ class Auth0TokenError(Exception):
     pass
 
 
-@lru_cache()
-def get_auth0_public_key():
-    """Get Auth0 public key for JWT verification."""
-    if not AUTH0_DOMAIN:
-        raise Auth0JWKSError("AUTH0_DOMAIN not configured")
-    
-    jwks_url = f"https://{AUTH0_DOMAIN}/.well-known/jwks.json"
+def jwk_to_rsa(jwk: Dict[str, Any]) -> RSAPublicKey:
+    """Build an RSA public key straight from a JWK's base64url n and e values."""
+    e = int.from_bytes(base64url_decode(jwk["e"]), "big")
+    n = int.from_bytes(base64url_decode(jwk["n"]), "big")
+    return RSAPublicNumbers(e, n).public_key()
+
+
+class _JWKSCache:
+    """
+    Auth0 JWKS cache with TTL expiry, ETag revalidation and single-flight refresh.
+
+    Public keys are parsed once per JWKS version and looked up by kid.
+    """
+
+    # Minimum time between forced refreshes triggered by unknown kids
+    MIN_REFRESH_INTERVAL = 30.0
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.jwks: Optional[Dict[str, Any]] = None
+        self.keys: Dict[str, RSAPublicKey] = {}
+        self.etag: Optional[str] = None
+        self.expires_at = 0.0
+        self.fetched_at = 0.0
+        self._lock = threading.Lock()
+        # Pooled client so refreshes reuse the keep-alive connection to Auth0
+        self._http = httpx.Client(timeout=AUTH0_REQUEST_TIMEOUT)
+
+    def _is_fresh(self) -> bool:
+        return self.jwks is not None and time.monotonic() < self.expires_at
+
+    def _max_age(self, cache_control: str) -> float:
+        for directive in cache_control.split(","):
+            name, _, value = directive.strip().partition("=")
+            if name.lower() == "max-age" and value.isdigit():
+                return max(float(value), self.MIN_REFRESH_INTERVAL)
+        return self.ttl
+
+    @staticmethod
+    def _parse_keys(jwks_keys: Any) -> Dict[str, RSAPublicKey]:
+        """Parse the usable RSA keys by kid, skipping (and logging) malformed ones."""
+        keys: Dict[str, RSAPublicKey] = {}
+        for key in jwks_keys:
+            if not isinstance(key, dict) or key.get("kty") != "RSA" or "kid" not in key:
+                continue
+            try:
+                keys[key["kid"]] = jwk_to_rsa(key)
+            except (ValueError, KeyError, TypeError) as e:
+                logger.warning("Skipping unusable JWK %r: %r", key.get("kid"), e)
+        return keys
+
+    def _fetch(self) -> None:
+        if not AUTH0_DOMAIN:
+            raise Auth0JWKSError("AUTH0_DOMAIN not configured")
+        
+        jwks_url = f"https://{AUTH0_DOMAIN}/.well-known/jwks.json"
+        headers = {"If-None-Match": self.etag} if self.etag and self.jwks is not None else {}
+        try:
+            response = self._http.get(jwks_url, headers=headers)
+            if response.status_code != 304:
+                response.raise_for_status()
+                jwks = response.json()
+                keys = self._parse_keys(jwks["keys"])
+                self.keys = keys
+                self.jwks = jwks
+                self.etag = response.headers.get("ETag")
+        except httpx.HTTPError as e:
+            raise Auth0JWKSError(f"Failed to fetch JWKS: {e}")
+        except (ValueError, KeyError, TypeError) as e:
+            # Undecodable body or no "keys" list: keep the previous keys
+            raise Auth0JWKSError(f"Invalid JWKS response: {e!r}")
+        
+        now = time.monotonic()
+        self.fetched_at = now
+        self.expires_at = now + self._max_age(response.headers.get("Cache-Control", ""))
+
+    def get(self, force_refresh: bool = False) -> Dict[str, Any]:
+        """Return the JWKS, refetching it when expired or when forced."""
+        if not force_refresh and self._is_fresh():
+            return self.jwks
+        
+        with self._lock:
+            # Another thread may have refreshed while this one was waiting
+            recently_fetched = time.monotonic() - self.fetched_at < self.MIN_REFRESH_INTERVAL
+            if self._is_fresh() and (not force_refresh or recently_fetched):
+                return self.jwks
+            self._fetch()
+            return self.jwks
+
+    def seconds_until_refresh(self, lead_time: float) -> float:
+        """Seconds until lead_time before expiry, never less than MIN_REFRESH_INTERVAL."""
+        remaining = self.expires_at - time.monotonic() - lead_time
+        return max(remaining, self.MIN_REFRESH_INTERVAL)
+
+    def get_key(self, kid: str) -> Optional[RSAPublicKey]:
+        """Return the public key for kid, refreshing once if it is unknown."""
+        self.get()
+        public_key = self.keys.get(kid)
+        if public_key is None:
+            # Unknown kid: Auth0 may have rotated its keys
+            self.get(force_refresh=True)
+            public_key = self.keys.get(kid)
+        return public_key
+
+
+_jwks_cache = _JWKSCache(ttl=AUTH0_CACHE_TTL)
+
+# Refresh the JWKS this long before it expires so requests never fetch it inline
+JWKS_EARLY_REFRESH = 60.0
+_jwks_refresh_task: Optional[asyncio.Task] = None
+
+
+async def _refresh_jwks_periodically() -> None:
+    while True:
+        await asyncio.sleep(_jwks_cache.seconds_until_refresh(JWKS_EARLY_REFRESH))
+        try:
+            await asyncio.to_thread(_jwks_cache.get, True)
+        except Auth0JWKSError as e:
+            logger.warning("JWKS refresh failed: %s", e)
+        except Exception:
+            # Never let an unexpected error end the refresh loop for the process
+            logger.exception("Unexpected error refreshing JWKS")
+
+
+async def start_jwks_refresh() -> None:
+    """Prefetch the JWKS at startup and keep refreshing it ahead of expiry."""
+    global _jwks_refresh_task
+    if not AUTH0_DOMAIN or _jwks_refresh_task is not None:
+        return
     try:
-        response = requests.get(jwks_url, timeout=10)
-        response.raise_for_status()
-        return response.json()
-    except requests.RequestException as e:
-        raise Auth0JWKSError(f"Failed to fetch JWKS: {e}")
+        await asyncio.to_thread(_jwks_cache.get)
+    except Auth0JWKSError as e:
+        logger.warning("JWKS prefetch failed: %s", e)
+    _jwks_refresh_task = asyncio.create_task(_refresh_jwks_periodically())
 
 
-def get_signing_key(token: str) -> str:
+async def stop_jwks_refresh() -> None:
+    """Cancel the background JWKS refresh task."""
+    global _jwks_refresh_task
+    if _jwks_refresh_task is None:
+        return
+    _jwks_refresh_task.cancel()
+    try:
+        await _jwks_refresh_task
+    except asyncio.CancelledError:
+        pass
+    _jwks_refresh_task = None
+
+
+def get_auth0_public_key():
+    """Get Auth0 public key set for JWT verification."""
+    return _jwks_cache.get()
+
+
+def get_signing_key(token: str) -> RSAPublicKey:
     """Get the signing key for token verification."""
     try:
-        # Get the token header
-        unverified_header = jwt.get_unverified_header(token)
-        
-        # Get Auth0 public keys
-        jwks = get_auth0_public_key()
-        
-        # Find the correct key
-        rsa_key = None
-        for key in jwks["keys"]:
-            if key["kid"] == unverified_header["kid"]:
-                rsa_key = {
-                    "kty": key["kty"],
-                    "kid": key["kid"],
-                    "use": key["use"],
-                    "n": key["n"],
-                    "e": key["e"]
-                }
-                break
-        
-        if not rsa_key:
+        kid = jwt.get_unverified_header(token)["kid"]
+        
+        public_key = _jwks_cache.get_key(kid)
+        if public_key is None:
             raise Auth0TokenError("Unable to find appropriate key")
         
-        # Construct the key using PyJWT's RSAAlgorithm
-        from jwt.algorithms import RSAAlgorithm
-        public_key = RSAAlgorithm.from_jwk(json.dumps(rsa_key))
         return public_key
         
     except Exception as e:
         raise Auth0TokenError(f"Failed to get signing key: {str(e)}")
 
 
+# Verified token payloads keyed by a digest of the token, so a client reusing
+# the same access token only pays for the RSA signature check once per TTL
+TOKEN_CACHE_TTL = float(os.getenv("TOKEN_CACHE_TTL", "60"))
+TOKEN_CACHE_MAX_ENTRIES = 50_000
+_token_cache = TTLCache(ttl=TOKEN_CACHE_TTL, max_entries=TOKEN_CACHE_MAX_ENTRIES)
+
+
+def _token_digest(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+def _cache_payload(digest: bytes, payload: Dict[str, Any]) -> None:
+    # Never keep a payload past the token's own expiry
+    ttl = None
+    if "exp" in payload:
+        ttl = float(payload["exp"]) - time.time()
+    _token_cache.set(digest, payload, ttl=ttl)
+
+
 def auth0_verify_token(token: str) -> Dict[str, Any]:
     """Verify Auth0 JWT token and return payload - matches Node.js auth0VerifyToken function."""
     if not AUTH0_DOMAIN or not AUTH0_AUDIENCE:
         raise Auth0TokenError("Auth0 configuration missing")
     
+    digest = _token_digest(token)
+    cached = _token_cache.get(digest)
+    if cached is not None:
+        return cached
+    
     try:
-        # Get signing key
+        # Get signing key (an already materialized RSAPublicKey)
         public_key = get_signing_key(token)
         
-        # Verify and decode the token
+        # Verify and decode the token; PyJWT uses key objects as-is instead of
+        # parsing a JWK or PEM on every call
         payload = jwt.decode(
             token,
             public_key,
             algorithms=AUTH0_ALGORITHMS,
             audience=AUTH0_AUDIENCE,
-            issuer=f"https://{AUTH0_DOMAIN}/"
+            issuer=AUTH0_ISSUER
         )
         
+        _cache_payload(digest, payload)
         return payload
         
     except jwt.ExpiredSignatureError:
@@ -105,9 +263,20 @@ def auth0_verify_token(token: str) -> Dict[str, Any]:
         raise Auth0TokenError(f"Token verification failed: {str(e)}")
 
 
-def get_or_create_user_from_token(db: Session, token_payload: Dict[str, Any]) -> User:
-    """Get or create user from Auth0 token payload - matches Node.js authenticate middleware logic."""
-    
+def _user_column_values(user: User) -> Dict[str, Any]:
+    """Snapshot of a user's column attributes for the user cache."""
+    return {attr.key: getattr(user, attr.key) for attr in User.__mapper__.column_attrs}
+
+
+def _attach_user(db: Session, values: Dict[str, Any]) -> User:
+    """Attach a user rebuilt from column values to the session without a SELECT."""
+    user = User(**values)
+    make_transient_to_detached(user)
+    return db.merge(user, load=False)
+
+
+def _extract_claims(token_payload: Dict[str, Any]) -> Tuple[str, Optional[str], Optional[str]]:
+    """Return (sub, email, picture) from a token payload; raise 401 if sub is missing."""
     # Extract user ID from 'sub' claim (same as Node.js)
     user_id = token_payload.get("sub")
     if not user_id:
@@ -115,15 +284,32 @@ def get_or_create_user_from_token(db: Session, token_payload: Dict[str, Any]) ->
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User ID claim missing from token"
         )
+    # Custom claims (same as Node.js); only required when creating the user
+    return (
+        user_id,
+        token_payload.get("https://pecha-tool/email"),
+        token_payload.get("https://pecha-tool/picture"),
+    )
+
+
+def get_or_create_user_from_token(
+    db: Session,
+    token_payload: Dict[str, Any],
+    claims: Optional[Tuple[str, Optional[str], Optional[str]]] = None,
+) -> User:
+    """Get or create user from Auth0 token payload - matches Node.js authenticate middleware logic."""
+    user_id, user_email, picture = claims or _extract_claims(token_payload)
+    
+    # Fast path: rebuild the user from cached column values and attach it to
+    # this session without a SELECT
+    cached = get_cached_user(user_id)
+    if cached is not None:
+        return _attach_user(db, cached)
     
     # Try to find existing user by Auth0 ID
     user = db.query(User).filter(User.auth0_user_id == user_id).first()
     
     if not user:
-        # Extract custom claims (same as Node.js)
-        user_email = token_payload.get("https://pecha-tool/email")
-        picture = token_payload.get("https://pecha-tool/picture")
-        
         if not user_email or not picture:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -145,11 +331,18 @@ def get_or_create_user_from_token(db: Session, token_payload: Dict[str, Any]) ->
         )
         
         db.add(user)
+        # The INSERT returns server-generated columns (eager_defaults), so the
+        # snapshot is complete without a refresh SELECT after the commit
+        db.flush()
+        values = _user_column_values(user)
         db.commit()
-        db.refresh(user)
         
-        print(f"✅ Created new user: {username} ({user_email})")
+        logger.info("Created new user: %s (%s)", username, user_email)
+        
+        cache_user(user_id, values)
+        return _attach_user(db, values)
     
+    cache_user(user_id, _user_column_values(user))
     return user
 
 
@@ -173,8 +366,11 @@ def authenticate(
         # Verify the token with Auth0 (same as Node.js validateAuth0Token + auth0VerifyToken)
         token_payload = auth0_verify_token(access_token)
         
+        # Reject tokens without the required claims before touching the database
+        claims = _extract_claims(token_payload)
+        
         # Get or create user from token payload (same as Node.js logic)
-        user = get_or_create_user_from_token(db, token_payload)
+        user = get_or_create_user_from_token(db, token_payload, claims)
         
         if not user.is_active:
             raise HTTPException(
@@ -185,13 +381,13 @@ def authenticate(
         return user
         
     except Auth0TokenError as e:
-        print(f"❌ Authentication error: {str(e)}")
+        logger.info("Authentication error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Authentication failed"
         )
     except Exception as e:
-        print(f"❌ Unexpected authentication error: {str(e)}")
+        logger.warning("Unexpected authentication error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Authentication failed"
@@ -205,11 +401,14 @@ get_current_active_user = authenticate
 
 def require_role(required_roles: list[UserRole]):
     """Decorator to require specific user roles."""
+    allowed_roles = frozenset(required_roles)
+    required_roles_text = str([role.value for role in required_roles])
+    
     def role_checker(current_user: User = Depends(authenticate)) -> User:
-        if current_user.role not in required_roles:
+        if current_user.role not in allowed_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Access denied. Required roles: {[role.value for role in required_roles]}, your role: {current_user.role.value}"
+                detail=f"Access denied. Required roles: {required_roles_text}, your role: {current_user.role.value}"
             )
         return current_user
     return role_checker
@@ -17,11 +17,6 @@ def create_annotation_type(
     db: Session, current_user: User, annotation_type_in: AnnotationTypeCreate
 ):
     """Create a new annotation type (admin only)."""
-    if current_user.role.value != "admin":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only admins can create annotation types",
-        )
     existing = annotation_type_crud.get_by_name(db=db, name=annotation_type_in.name)
     if existing:
         raise HTTPException(
@@ -68,11 +63,6 @@ def update_annotation_type(
     annotation_type_in: AnnotationTypeUpdate,
 ):
     """Update an annotation type (admin only)."""
-    if current_user.role.value != "admin":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only admins can update annotation types",
-        )
     if annotation_type_in.name:
         existing = annotation_type_crud.get_by_name(
             db=db, name=annotation_type_in.name
@@ -97,11 +87,6 @@ def delete_annotation_type(
     db: Session, current_user: User, type_id: str
 ) -> dict:
     """Delete an annotation type (admin only)."""
-    if current_user.role.value != "admin":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only admins can delete annotation types",
-        )
     success = annotation_type_crud.delete(db=db, type_id=type_id)
     if not success:
         raise HTTPException(
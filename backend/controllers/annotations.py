@@ -19,6 +19,7 @@ def read_annotations(
     text_id: Optional[int] = None,
     annotator_id: Optional[int] = None,
     annotation_type: Optional[str] = None,
+    after_id: Optional[int] = None,
 ) -> List:
     """Get annotations list with optional filtering."""
     return annotation_crud.get_multi(
@@ -28,6 +29,7 @@ def read_annotations(
         text_id=text_id,
         annotator_id=annotator_id,
         annotation_type=annotation_type,
+        after_id=after_id,
     )
 
 
@@ -35,31 +37,33 @@ def create_annotation(
     db: Session, current_user: User, annotation_in: AnnotationCreate
 ):
     """Create new annotation. Annotator or user who uploaded the text."""
-    if current_user.role.value not in ("admin", "annotator"):
-        if current_user.role.value == "user":
-            text = text_crud.get(db=db, text_id=annotation_in.text_id)
-            if not text:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Text not found",
-                )
-            if text.uploaded_by != current_user.id:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="You can only annotate texts you uploaded",
-                )
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Role '{current_user.role.value}' is not allowed to create annotations",
-            )
+    role = current_user.role.value
+    if role not in ("admin", "annotator", "user"):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Role '{role}' is not allowed to create annotations",
+        )
 
-    validation_result = annotation_crud.validate_annotation_positions(
+    # One fetch of the text serves the ownership check and position validation
+    validation_result = annotation_crud.validate_with_text(
         db=db,
         text_id=annotation_in.text_id,
         start_pos=annotation_in.start_position,
         end_pos=annotation_in.end_position,
     )
+    text = validation_result["text"]
+    if role == "user":
+        if not text:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Text not found",
+            )
+        if text.uploaded_by != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You can only annotate texts you uploaded",
+            )
+
     if not validation_result["valid"]:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -74,11 +78,15 @@ def create_annotation(
 
 
 def read_my_annotations(
-    db: Session, current_user: User, skip: int = 0, limit: int = 100
+    db: Session,
+    current_user: User,
+    skip: int = 0,
+    limit: int = 100,
+    after_id: Optional[int] = None,
 ) -> List:
     """Get current user's annotations."""
     return annotation_crud.get_by_annotator(
-        db=db, annotator_id=current_user.id, skip=skip, limit=limit
+        db=db, annotator_id=current_user.id, skip=skip, limit=limit, after_id=after_id
     )
 
 
@@ -93,6 +101,7 @@ def read_annotations_by_type(
     annotation_type: str,
     skip: int = 0,
     limit: int = 100,
+    after_id: Optional[int] = None,
 ) -> List:
     """Get annotations by type."""
     return annotation_crud.get_by_type(
@@ -100,6 +109,7 @@ def read_annotations_by_type(
         annotation_type=annotation_type,
         skip=skip,
         limit=limit,
+        after_id=after_id,
     )
 
 
@@ -128,7 +138,9 @@ def update_annotation(
     annotation_in: AnnotationUpdate,
 ):
     """Update annotation."""
-    annotation = annotation_crud.get(db=db, annotation_id=annotation_id)
+    annotation, is_agreed = annotation_crud.get_with_agreement(
+        db=db, annotation_id=annotation_id, for_update=True
+    )
     if not annotation:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -140,7 +152,7 @@ def update_annotation(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions",
         )
-    if annotation_crud.is_annotation_agreed(db=db, annotation_id=annotation_id):
+    if is_agreed:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot modify annotation that has been agreed upon by a reviewer",
@@ -172,7 +184,9 @@ def update_annotation(
 
 def delete_annotation(db: Session, current_user: User, annotation_id: int) -> None:
     """Delete annotation."""
-    annotation = annotation_crud.get(db=db, annotation_id=annotation_id)
+    annotation, is_agreed = annotation_crud.get_with_agreement(
+        db=db, annotation_id=annotation_id, for_update=True
+    )
     if not annotation:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -183,7 +197,7 @@ def delete_annotation(db: Session, current_user: User, annotation_id: int) -> No
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions",
         )
-    if annotation_crud.is_annotation_agreed(db=db, annotation_id=annotation_id):
+    if is_agreed:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot delete annotation that has been agreed upon by a reviewer",
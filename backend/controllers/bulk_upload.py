@@ -1,14 +1,19 @@
 """Bulk upload route actions. All functions take db, current_user, and request data; return result or raise HTTPException."""
 
-import json
-from typing import Any, Dict, List, Optional
+import asyncio
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple, Union
 
 from fastapi import HTTPException, status, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
 from crud.text import text_crud
-from crud.annotation import annotation_crud
 from models.text import Text
 from models.annotation import Annotation
 from schemas.bulk_upload import (
@@ -16,85 +21,147 @@ from schemas.bulk_upload import (
     BulkUploadResponse,
     BulkUploadResult,
     BulkAnnotationData,
-    BulkTextData,
 )
-from schemas.text import TextCreate
-from schemas.annotation import AnnotationCreate
+
+
+# Upper bound on uploaded files read at the same time (each may be a temp file)
+FILE_READ_CONCURRENCY = 16
+# Validated files waiting for the database, and the most flushed per INSERT batch
+UPLOAD_QUEUE_SIZE = 64
+BULK_INSERT_BATCH_SIZE = 200
+
+# Built once at import and shared by every uploaded file
+_BULK_ADAPTER = TypeAdapter(BulkUploadFileData)
+
+
+@dataclass
+class ValidationRow:
+    """Validation outcome of one file in validate_multiple_files."""
+    __slots__ = ("filename", "valid", "errors", "text_title", "annotations_count")
+
+    filename: str
+    valid: bool
+    errors: List[str]
+    text_title: Optional[str]
+    annotations_count: int
+
+
+async def _read_json_file(file: UploadFile) -> Union[bytes, Exception, None]:
+    """Read an uploaded file: its bytes, the exception raised reading it, or None if not .json."""
+    if not (file.filename or "unknown").endswith(".json"):
+        return None
+    try:
+        return await file.read()
+    except Exception as e:
+        return e
+
+
+async def _read_json_files(
+    files: List[UploadFile],
+) -> List[Union[bytes, Exception, None]]:
+    """Read the uploaded .json files, at most FILE_READ_CONCURRENCY at a time (see _read_json_file)."""
+    semaphore = asyncio.Semaphore(FILE_READ_CONCURRENCY)
+
+    async def read(file: UploadFile) -> Union[bytes, Exception, None]:
+        async with semaphore:
+            return await _read_json_file(file)
+
+    return await asyncio.gather(*(read(file) for file in files))
 
 
 def _validate_json_file(
-    file_content: str,
+    file_content: bytes,
 ) -> tuple[bool, Optional[BulkUploadFileData], List[str]]:
-    """Validate a single JSON file and return parsed data or errors."""
+    """Validate a single JSON file (raw UTF-8 bytes) and return parsed data or errors."""
     try:
-        data = json.loads(file_content)
-        file_data = BulkUploadFileData(**data)
+        # Parses and validates in one pass, without building an intermediate dict
+        file_data = _BULK_ADAPTER.validate_json(file_content)
         return True, file_data, []
-    except json.JSONDecodeError as e:
-        return False, None, [f"Invalid JSON format: {str(e)}"]
+    except ValidationError as e:
+        errors = []
+        for error in e.errors():
+            if error["type"] == "json_invalid":
+                return False, None, [f"Invalid JSON format: {error['msg']}"]
+            loc = " -> ".join(str(x) for x in error["loc"])
+            errors.append(f"{loc}: {error['msg']}")
+        return False, None, errors
     except Exception as e:
-        if hasattr(e, "errors"):
-            errors = []
-            for error in e.errors():
-                loc = " -> ".join(str(x) for x in error["loc"])
-                errors.append(f"{loc}: {error['msg']}")
-            return False, None, errors
         return False, None, [f"Validation error: {str(e)}"]
 
 
-def _create_text_from_data(
+def _insert_files(
     db: Session,
-    text_data: BulkTextData,
-    uploaded_by: Optional[int] = None,
+    files_data: List[BulkUploadFileData],
     annotation_type_id: Optional[str] = None,
-) -> Text:
-    """Create a text record from BulkTextData."""
-    text_create = TextCreate(
-        title=text_data.title,
-        content=text_data.content,
-        translation=text_data.translation,
-        source="Bulk Upload",
-        language=text_data.language,
-        uploaded_by=uploaded_by,
-        annotation_type_id=annotation_type_id,
-    )
-    return text_crud.create(db=db, obj_in=text_create)
-
-
-def _create_annotations_from_data(
-    db: Session,
-    text_id: int,
-    annotations_data: List[BulkAnnotationData],
-    annotator_id: Optional[int],
-) -> List[Annotation]:
-    """Create annotation records from BulkAnnotationData list."""
-    created = []
-    for annotation_data in annotations_data:
-        annotation_create = AnnotationCreate(
-            text_id=text_id,
-            annotation_type=annotation_data.annotation_type,
-            start_position=annotation_data.start_position,
-            end_position=annotation_data.end_position,
-            selected_text=annotation_data.selected_text,
-            label=annotation_data.label,
-            name=annotation_data.name,
-            meta=annotation_data.meta,
-            confidence=annotation_data.confidence,
-        )
-        ann = annotation_crud.create_bulk(
-            db=db, obj_in=annotation_create, annotator_id=annotator_id
+) -> List[Tuple[Optional[int], int]]:
+    """
+    Insert the texts and annotations of validated files in two batched statements.
+
+    Texts whose title already exists are skipped by ON CONFLICT (title) DO NOTHING
+    and come back with a text_id of None. Titles must be unique within files_data.
+
+    Returns (text_id, created_annotations) per file, in input order. Does not commit.
+    """
+    text_rows = [
+        {
+            "title": file_data.text.title,
+            "content": file_data.text.content,
+            "translation": file_data.text.translation,
+            "source": "Bulk Upload",
+            "language": file_data.text.language,
+            "uploaded_by": None,
+            "annotation_type_id": annotation_type_id or file_data.text.annotation_type_id,
+        }
+        for file_data in files_data
+    ]
+    inserted = db.execute(
+        pg_insert(Text)
+        .values(text_rows)
+        .on_conflict_do_nothing(index_elements=[Text.title])
+        .returning(Text.id, Text.title)
+    ).all()
+    id_by_title = {title: text_id for text_id, title in inserted}
+    text_ids = [id_by_title.get(file_data.text.title) for file_data in files_data]
+
+    annotation_rows = [
+        {
+            "text_id": text_id,
+            "annotator_id": None,  # System annotations
+            "annotation_type": annotation_data.annotation_type,
+            "start_position": annotation_data.start_position,
+            "end_position": annotation_data.end_position,
+            "selected_text": annotation_data.selected_text,
+            "label": annotation_data.label,
+            "name": annotation_data.name,
+            "level": None,
+            "meta": annotation_data.meta,
+            "confidence": annotation_data.confidence,
+        }
+        for text_id, file_data in zip(text_ids, files_data)
+        if text_id is not None
+        for annotation_data in file_data.annotations
+    ]
+    if annotation_rows:
+        # Note: No text status update for bulk operations
+        db.execute(
+            insert(Annotation),
+            annotation_rows,
+            execution_options={"render_nulls": True},
         )
-        created.append(ann)
-    return created
+
+    return [
+        (text_id, len(file_data.annotations) if text_id is not None else 0)
+        for text_id, file_data in zip(text_ids, files_data)
+    ]
 
 
 def _check_title_uniqueness(
-    db: Session, title: str, existing_titles: set
+    title: str, titles_in_batch: Set[str], titles_in_db: Optional[Set[str]] = None
 ) -> Optional[str]:
-    """Check if title is unique in DB and within batch."""
-    if title in existing_titles:
+    """Check if title is unique within batch and, if given, in DB (prefetched titles)."""
+    if title in titles_in_batch:
         return f"Duplicate title '{title}' found within upload batch"
-    if text_crud.get_by_title(db, title=title):
+    if titles_in_db and title in titles_in_db:
         return f"Text title '{title}' already exists in database"
     return None
 
@@ -103,6 +170,9 @@ def _validate_annotation_bounds(
     annotation: BulkAnnotationData, text_length: int
 ) -> Optional[str]:
     """Validate that annotation positions are within text bounds."""
+    # One fused check for the common valid case; diagnose only on failure
+    if 0 <= annotation.start_position < annotation.end_position <= text_length:
+        return None
     if annotation.start_position < 0:
         return "start_position cannot be negative"
     if annotation.end_position < 0:
@@ -116,6 +186,45 @@ def _validate_annotation_bounds(
     return None
 
 
+def _annotation_bounds_errors(
+    annotations: List[BulkAnnotationData], text_length: int
+) -> List[str]:
+    """Bounds errors for a file's annotations, numbered from 1."""
+    if all(
+        0 <= a.start_position < a.end_position <= text_length for a in annotations
+    ):
+        return []
+    errors = []
+    for i, annotation in enumerate(annotations):
+        bounds_error = _validate_annotation_bounds(annotation, text_length)
+        if bounds_error:
+            errors.append(f"Annotation {i+1}: {bounds_error}")
+    return errors
+
+
+def _insert_result(
+    filename: str, title: str, text_id: Optional[int], created_annotations: int
+) -> BulkUploadResult:
+    """Result for a file passed to _insert_files; text_id is None on a title conflict."""
+    if text_id is None:
+        return BulkUploadResult(
+            filename=filename,
+            success=False,
+            text_id=None,
+            created_annotations=0,
+            error=f"Text title '{title}' already exists in database",
+            validation_errors=None,
+        )
+    return BulkUploadResult(
+        filename=filename,
+        success=True,
+        text_id=text_id,
+        created_annotations=created_annotations,
+        error=None,
+        validation_errors=None,
+    )
+
+
 def _process_single_file(
     db: Session,
     file_data: BulkUploadFileData,
@@ -125,26 +234,12 @@ def _process_single_file(
 ) -> BulkUploadResult:
     """Process a single validated file and create database records."""
     try:
-        final_annotation_type_id = (
-            annotation_type_id or file_data.text.annotation_type_id
-        )
-        text = _create_text_from_data(
-            db,
-            file_data.text,
-            uploaded_by=None,
-            annotation_type_id=final_annotation_type_id,
-        )
-        annotations = _create_annotations_from_data(
-            db, text.id, file_data.annotations, annotator_id=None
+        [(text_id, created_annotations)] = _insert_files(
+            db, [file_data], annotation_type_id
         )
         db.commit()
-        return BulkUploadResult(
-            filename=filename,
-            success=True,
-            text_id=text.id,
-            created_annotations=len(annotations),
-            error=None,
-            validation_errors=None,
+        return _insert_result(
+            filename, file_data.text.title, text_id, created_annotations
         )
     except IntegrityError as e:
         db.rollback()
@@ -171,99 +266,177 @@ def _process_single_file(
         )
 
 
+def _insert_batch(
+    db: Session,
+    batch: List[Tuple[int, str, BulkUploadFileData]],
+    annotator_id: int,
+    annotation_type_id: Optional[str] = None,
+) -> List[Tuple[int, BulkUploadResult]]:
+    """Insert a batch of validated files and commit; returns (index, result) pairs."""
+    try:
+        inserted = _insert_files(
+            db, [file_data for _, _, file_data in batch], annotation_type_id
+        )
+        db.commit()
+        return [
+            (
+                index,
+                _insert_result(
+                    filename, file_data.text.title, text_id, created_annotations
+                ),
+            )
+            for (index, filename, file_data), (text_id, created_annotations) in zip(
+                batch, inserted
+            )
+        ]
+    except SQLAlchemyError:
+        # One bad file fails the whole batch; redo file by file so only
+        # the offending files are reported
+        db.rollback()
+        return [
+            (
+                index,
+                _process_single_file(
+                    db, file_data, filename, annotator_id, annotation_type_id
+                ),
+            )
+            for index, filename, file_data in batch
+        ]
+
+
 async def upload_multiple_files(
     db: Session,
     current_user: Any,
     files: List[UploadFile],
     annotation_type_id: Optional[str] = None,
 ) -> BulkUploadResponse:
-    """Upload multiple JSON files for bulk text and annotation creation (admin only)."""
+    """
+    Upload multiple JSON files for bulk text and annotation creation (admin only).
+
+    Files are validated by a producer and inserted in batches by a consumer, so
+    reading and validating later files overlaps with the INSERTs of earlier ones.
+    """
     if not files:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="No files provided",
         )
 
-    results = []
     total_files = len(files)
+    results: List[Optional[BulkUploadResult]] = [None] * total_files
     successful_files = 0
     total_texts_created = 0
     total_annotations_created = 0
     titles_in_batch = set()
+    # (index in results, filename, data) for files that passed validation;
+    # None marks the end of the upload
+    queue: asyncio.Queue = asyncio.Queue(maxsize=UPLOAD_QUEUE_SIZE)
+    # Reads run at most FILE_READ_CONCURRENCY files ahead of validation, so only
+    # that many files' bytes are held on top of the queued ones
+    reads: Deque[asyncio.Future] = deque()
+    next_read = 0
+
+    def schedule_reads() -> None:
+        nonlocal next_read
+        while next_read < total_files and len(reads) < FILE_READ_CONCURRENCY:
+            reads.append(asyncio.ensure_future(_read_json_file(files[next_read])))
+            next_read += 1
+
+    def cancel_reads() -> None:
+        while reads:
+            reads.popleft().cancel()
+
+    def failure(filename: str, error: str, validation_errors=None) -> BulkUploadResult:
+        return BulkUploadResult(
+            filename=filename,
+            success=False,
+            text_id=None,
+            created_annotations=0,
+            error=error,
+            validation_errors=validation_errors,
+        )
 
-    for file in files:
-        filename = file.filename or "unknown"
-        if not filename.endswith(".json"):
-            results.append(
-                BulkUploadResult(
-                    filename=filename,
-                    success=False,
-                    text_id=None,
-                    created_annotations=0,
-                    error="Only JSON files are supported",
-                    validation_errors=None,
-                )
-            )
-            continue
-
+    async def produce() -> None:
+        cancelled = False
         try:
-            content = await file.read()
-            file_content = content.decode("utf-8")
-            is_valid, file_data, validation_errors = _validate_json_file(
-                file_content
-            )
+            for index, file in enumerate(files):
+                schedule_reads()
+                read = reads.popleft()
+                filename = file.filename or "unknown"
+                if not filename.endswith(".json"):
+                    results[index] = failure(filename, "Only JSON files are supported")
+                    continue
+
+                try:
+                    content = await read
+                    if isinstance(content, Exception):
+                        raise content
+                    is_valid, file_data, validation_errors = _validate_json_file(
+                        content
+                    )
+                    if not is_valid:
+                        results[index] = failure(
+                            filename, "Schema validation failed", validation_errors
+                        )
+                        continue
 
-            if not is_valid:
-                results.append(
-                    BulkUploadResult(
-                        filename=filename,
-                        success=False,
-                        text_id=None,
-                        created_annotations=0,
-                        error="Schema validation failed",
-                        validation_errors=validation_errors,
+                    # Titles already in the database are caught by the INSERT itself
+                    title_error = _check_title_uniqueness(
+                        file_data.text.title, titles_in_batch
                     )
-                )
-                continue
+                    if title_error:
+                        results[index] = failure(filename, title_error)
+                        continue
 
-            title_error = _check_title_uniqueness(
-                db, file_data.text.title, titles_in_batch
-            )
-            if title_error:
-                results.append(
-                    BulkUploadResult(
-                        filename=filename,
-                        success=False,
-                        text_id=None,
-                        created_annotations=0,
-                        error=title_error,
-                        validation_errors=None,
+                    titles_in_batch.add(file_data.text.title)
+                except Exception as e:
+                    results[index] = failure(
+                        filename, f"File processing error: {str(e)}"
                     )
+                    continue
+
+                await queue.put((index, filename, file_data))
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        finally:
+            cancel_reads()
+            # Cancelled only when consume() failed: nobody waits for the end marker
+            if not cancelled:
+                await queue.put(None)
+
+    async def consume() -> None:
+        finished = False
+        while not finished:
+            # Wait for one file, then take whatever else is already queued
+            batch = [await queue.get()]
+            while len(batch) < BULK_INSERT_BATCH_SIZE and not queue.empty():
+                batch.append(queue.get_nowait())
+            if batch[-1] is None:
+                finished = True
+                batch.pop()
+            if batch:
+                # The session is only used here, one batch at a time
+                inserted = await run_in_threadpool(
+                    _insert_batch, db, batch, current_user.id, annotation_type_id
                 )
-                continue
-
-            titles_in_batch.add(file_data.text.title)
-            result = _process_single_file(
-                db, file_data, filename, current_user.id, annotation_type_id
-            )
-            results.append(result)
-
-            if result.success:
-                successful_files += 1
-                total_texts_created += 1
-                total_annotations_created += result.created_annotations
+                for index, result in inserted:
+                    results[index] = result
 
-        except Exception as e:
-            results.append(
-                BulkUploadResult(
-                    filename=filename,
-                    success=False,
-                    text_id=None,
-                    created_annotations=0,
-                    error=f"File processing error: {str(e)}",
-                    validation_errors=None,
-                )
-            )
+    producer = asyncio.ensure_future(produce())
+    try:
+        await consume()
+    except BaseException:
+        producer.cancel()
+        cancel_reads()
+        raise
+    await producer
+
+    for result in results:
+        if result.success:
+            successful_files += 1
+            total_texts_created += 1
+            total_annotations_created += result.created_annotations
 
     failed_files = total_files - successful_files
     overall_success = successful_files > 0
@@ -300,82 +473,70 @@ async def validate_multiple_files(
             detail="No files provided",
         )
 
-    validation_results = []
     total_files = len(files)
+    validation_results: List[Optional[ValidationRow]] = [None] * total_files
     valid_files = 0
     titles_in_batch = set()
+    # (index in validation_results, data) for files that passed schema validation
+    validated: List[Tuple[int, BulkUploadFileData]] = []
+
+    contents = await _read_json_files(files)
 
-    for file in files:
+    for index, (file, content) in enumerate(zip(files, contents)):
         filename = file.filename or "unknown"
         if not filename.endswith(".json"):
-            validation_results.append({
-                "filename": filename,
-                "valid": False,
-                "errors": ["Only JSON files are supported"],
-                "text_title": None,
-                "annotations_count": 0,
-            })
+            validation_results[index] = ValidationRow(
+                filename, False, ["Only JSON files are supported"], None, 0
+            )
             continue
 
         try:
-            content = await file.read()
-            file_content = content.decode("utf-8")
+            if isinstance(content, Exception):
+                raise content
             is_valid, file_data, validation_errors = _validate_json_file(
-                file_content
+                content
             )
 
             if is_valid:
-                additional_errors = []
-                title_error = _check_title_uniqueness(
-                    db, file_data.text.title, titles_in_batch
+                additional_errors = _annotation_bounds_errors(
+                    file_data.annotations, len(file_data.text.content)
+                )
+                # "valid" is settled after the title check below
+                validated.append((index, file_data))
+                validation_results[index] = ValidationRow(
+                    filename,
+                    False,
+                    additional_errors,
+                    file_data.text.title,
+                    len(file_data.annotations),
                 )
-                if title_error:
-                    additional_errors.append(title_error)
-                else:
-                    titles_in_batch.add(file_data.text.title)
-                text_length = len(file_data.text.content)
-                for i, annotation in enumerate(file_data.annotations):
-                    bounds_error = _validate_annotation_bounds(
-                        annotation, text_length
-                    )
-                    if bounds_error:
-                        additional_errors.append(
-                            f"Annotation {i+1}: {bounds_error}"
-                        )
-                if additional_errors:
-                    validation_results.append({
-                        "filename": filename,
-                        "valid": False,
-                        "errors": additional_errors,
-                        "text_title": file_data.text.title,
-                        "annotations_count": len(file_data.annotations),
-                    })
-                else:
-                    valid_files += 1
-                    validation_results.append({
-                        "filename": filename,
-                        "valid": True,
-                        "errors": [],
-                        "text_title": file_data.text.title,
-                        "annotations_count": len(file_data.annotations),
-                    })
             else:
-                validation_results.append({
-                    "filename": filename,
-                    "valid": False,
-                    "errors": validation_errors,
-                    "text_title": None,
-                    "annotations_count": 0,
-                })
+                validation_results[index] = ValidationRow(
+                    filename, False, validation_errors, None, 0
+                )
 
         except Exception as e:
-            validation_results.append({
-                "filename": filename,
-                "valid": False,
-                "errors": [f"File processing error: {str(e)}"],
-                "text_title": None,
-                "annotations_count": 0,
-            })
+            validation_results[index] = ValidationRow(
+                filename, False, [f"File processing error: {str(e)}"], None, 0
+            )
+
+    titles_in_db = await run_in_threadpool(
+        text_crud.get_existing_titles,
+        db,
+        [file_data.text.title for _, file_data in validated],
+    )
+    for index, file_data in validated:
+        row = validation_results[index]
+        title_error = _check_title_uniqueness(
+            file_data.text.title, titles_in_batch, titles_in_db
+        )
+        if title_error:
+            row.errors.insert(0, title_error)
+        else:
+            titles_in_batch.add(file_data.text.title)
+        if not row.errors:
+            row.valid = True
+            valid_files += 1
 
     return {
         "total_files": total_files,
@@ -384,5 +545,5 @@ async def validate_multiple_files(
         "validation_rate": round((valid_files / total_files * 100), 2)
         if total_files > 0
         else 0,
-        "results": validation_results,
+        "results": [asdict(row) for row in validation_results],
     }
@@ -1,10 +1,11 @@
 """Export route actions. All functions take db, current_user, and request data; return result or raise HTTPException."""
 
-import json
-from datetime import datetime
-from io import BytesIO
-from typing import Any
+import re
+import zipfile
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, List, Tuple
 
+import orjson
 from fastapi import HTTPException, status
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
@@ -13,6 +14,21 @@ from crud.text import text_crud
 from crud.annotation import annotation_crud
 
 
+def _parse_date_range(from_date: str, to_date: str) -> Tuple[datetime, datetime]:
+    """Parse YYYY-MM-DD bounds into naive midnight datetimes, raising 400 if malformed."""
+    # date.fromisoformat takes no time or UTC offset, so the bounds are always
+    # comparable naive values
+    try:
+        return (
+            datetime.combine(date.fromisoformat(from_date), datetime.min.time()),
+            datetime.combine(date.fromisoformat(to_date), datetime.min.time()),
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=400, detail="Invalid date format. Use YYYY-MM-DD"
+        )
+
+
 def get_export_stats(
     db: Session,
     current_user: Any,
@@ -21,13 +37,7 @@ def get_export_stats(
     filter_type: str = "annotated",
 ) -> dict:
     """Get statistics for texts and annotations within a date range (admin only)."""
-    try:
-        start_date = datetime.strptime(from_date, "%Y-%m-%d")
-        end_date = datetime.strptime(to_date, "%Y-%m-%d")
-    except ValueError:
-        raise HTTPException(
-            status_code=400, detail="Invalid date format. Use YYYY-MM-DD"
-        )
+    start_date, end_date = _parse_date_range(from_date, to_date)
 
     if start_date > end_date:
         raise HTTPException(
@@ -42,10 +52,9 @@ def get_export_stats(
     texts = text_crud.get_texts_by_date_range_and_filter(
         db, start_date, end_date, filter_type
     )
-    total_annotations = 0
-    for text in texts:
-        annotations = annotation_crud.get_by_text(db, text.id)
-        total_annotations += len(annotations)
+    total_annotations = annotation_crud.count_by_text_ids(
+        db, [text.id for text in texts]
+    )
 
     return {
         "total_texts": len(texts),
@@ -54,21 +63,110 @@ def get_export_stats(
     }
 
 
+# Anything but str.isalnum() characters, "_", " " and "-" (\w is isalnum() plus "_")
+_UNSAFE_TITLE_CHARS = re.compile(r"[^\w \-]")
+
+
+class _ZipChunkSink:
+    """Unseekable write target for zipfile whose output is drained in chunks."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _export_text_file(text: Any, annotations: List[Any]) -> Tuple[str, bytes]:
+    """
+    Build the archive filename and JSON bytes for one exported text.
+
+    annotations are rows from annotation_crud.get_export_projection_by_text_ids.
+    """
+    formatted_annotations = []
+    for annotation in annotations:
+        annotation_data = {
+            "annotation_type": annotation.annotation_type,
+            "start_position": annotation.start_position,
+            "end_position": annotation.end_position,
+            "label": annotation.label or annotation.annotation_type,
+        }
+        if annotation.name:
+            annotation_data["name"] = annotation.name
+        if annotation.level:
+            annotation_data["level"] = annotation.level
+        if annotation.selected_text:
+            annotation_data["selected_text"] = annotation.selected_text
+        if annotation.confidence is not None:
+            annotation_data["confidence"] = annotation.confidence
+        if annotation.meta:
+            annotation_data["meta"] = annotation.meta
+        formatted_annotations.append(annotation_data)
+
+    export_data = {
+        "text": {"title": text.title, "content": text.content},
+        "annotations": formatted_annotations,
+    }
+    if text.translation:
+        export_data["text"]["translation"] = text.translation
+    if getattr(text, "language", None):
+        export_data["text"]["language"] = text.language
+    if getattr(text, "source", None):
+        export_data["text"]["source"] = text.source
+
+    safe_title = _UNSAFE_TITLE_CHARS.sub("", text.title).rstrip().replace(" ", "_")
+    filename = f"text_{text.id}_{safe_title[:50]}.json"
+    return filename, orjson.dumps(export_data, option=orjson.OPT_INDENT_2)
+
+
+def _iter_export_zip(
+    texts: List[Any], annotations_by_text: Dict[int, List[Any]], compress: bool = False
+) -> Iterator[bytes]:
+    """
+    Yield the export ZIP archive chunk by chunk, one text file at a time.
+
+    Files are stored uncompressed unless compress is set, in which case they are
+    deflated at level 1 (fast, most of the gain on JSON).
+    """
+    if compress:
+        compression, compresslevel = zipfile.ZIP_DEFLATED, 1
+    else:
+        compression, compresslevel = zipfile.ZIP_STORED, None
+    sink = _ZipChunkSink()
+    with zipfile.ZipFile(
+        sink, "w", compression, compresslevel=compresslevel
+    ) as zip_file:
+        for text in texts:
+            filename, json_bytes = _export_text_file(
+                text, annotations_by_text[text.id]
+            )
+            zip_file.writestr(filename, json_bytes)
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    # Central directory, written when the archive is closed
+    yield sink.drain()
+
+
 def export_data(
     db: Session,
     current_user: Any,
     from_date: str,
     to_date: str,
     filter_type: str = "annotated",
+    compress: bool = False,
 ) -> StreamingResponse:
     """Export texts and annotations as a ZIP file (admin only)."""
-    try:
-        start_date = datetime.strptime(from_date, "%Y-%m-%d")
-        end_date = datetime.strptime(to_date, "%Y-%m-%d")
-    except ValueError:
-        raise HTTPException(
-            status_code=400, detail="Invalid date format. Use YYYY-MM-DD"
-        )
+    start_date, end_date = _parse_date_range(from_date, to_date)
 
     if start_date > end_date:
         raise HTTPException(
@@ -89,58 +187,14 @@ def export_data(
             detail="No texts found in the specified date range",
         )
 
-    import zipfile
-
-    zip_buffer = BytesIO()
-    with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
-        for text in texts:
-            annotations = annotation_crud.get_by_text(db, text.id)
-            formatted_annotations = []
-            for annotation in annotations:
-                annotation_data = {
-                    "annotation_type": annotation.annotation_type,
-                    "start_position": annotation.start_position,
-                    "end_position": annotation.end_position,
-                    "label": annotation.label or annotation.annotation_type,
-                }
-                if annotation.name:
-                    annotation_data["name"] = annotation.name
-                if annotation.level:
-                    annotation_data["level"] = annotation.level
-                if annotation.selected_text:
-                    annotation_data["selected_text"] = annotation.selected_text
-                if annotation.confidence is not None:
-                    annotation_data["confidence"] = annotation.confidence
-                if annotation.meta:
-                    annotation_data["meta"] = annotation.meta
-                formatted_annotations.append(annotation_data)
-
-            export_data = {
-                "text": {"title": text.title, "content": text.content},
-                "annotations": formatted_annotations,
-            }
-            if text.translation:
-                export_data["text"]["translation"] = text.translation
-            if getattr(text, "language", None):
-                export_data["text"]["language"] = text.language
-            if getattr(text, "source", None):
-                export_data["text"]["source"] = text.source
-
-            safe_title = "".join(
-                c for c in text.title if c.isalnum() or c in (" ", "-", "_")
-            ).rstrip().replace(" ", "_")
-            filename = f"text_{text.id}_{safe_title[:50]}.json"
-            json_content = json.dumps(
-                export_data, indent=2, ensure_ascii=False
-            )
-            zip_file.writestr(filename, json_content.encode("utf-8"))
+    annotations_by_text = annotation_crud.get_export_projection_by_text_ids(
+        db, [text.id for text in texts]
+    )
 
     export_filename = f"{filter_type}_export_{from_date}_to_{to_date}.zip"
-    zip_buffer.seek(0)
-    zip_content = zip_buffer.read()
 
     return StreamingResponse(
-        BytesIO(zip_content),
+        _iter_export_zip(texts, annotations_by_text, compress),
         media_type="application/zip",
         headers={
             "Content-Disposition": f"attachment; filename={export_filename}"
@@ -1,15 +1,18 @@
 """Review route actions. All functions take db, current_user, and request data; return result or raise HTTPException."""
 
+from collections import Counter
 from typing import List
 
 from fastapi import HTTPException, status
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
-from sqlalchemy.orm import joinedload
 
+from crud.annotation import annotation_crud
 from crud.annotation_review import annotation_review_crud
-from crud.text import text_crud
+from crud.text import CONTENT_PREVIEW_LENGTH, text_crud
 from models.user import User
-from models.text import Text, ANNOTATED, REVIEWED, REVIEWED_NEEDS_REVISION
+from models.text import ANNOTATED, REVIEWED, REVIEWED_NEEDS_REVISION
 from schemas.annotation_review import (
     AnnotationReviewCreate,
     ReviewSubmission,
@@ -18,67 +21,78 @@ from schemas.annotation_review import (
     ReviewSubmissionResponse,
     AnnotationReviewResponse,
 )
+from utils.stats_cache import (
+    TEXT_STATS_KEY,
+    cache_stats,
+    get_cached_stats,
+    invalidate_stats,
+    reviewer_stats_key,
+)
+
+
+_REVIEW_DECISIONS = frozenset(("agree", "disagree"))
+# Validates a whole list of ORM reviews in one call
+_REVIEW_LIST_ADAPTER = TypeAdapter(List[AnnotationReviewResponse])
+
+
+def _content_preview(preview: str) -> str:
+    """Display form of a content_preview column (see text_crud._preview_columns)."""
+    if len(preview) > CONTENT_PREVIEW_LENGTH:
+        return preview[:CONTENT_PREVIEW_LENGTH] + "..."
+    return preview
 
 
 def get_texts_for_review(
     db: Session, current_user: User, skip: int = 0, limit: int = 100
-) -> List[dict]:
+) -> ORJSONResponse:
     """Get texts ready for review with annotation count (reviewer only)."""
-    texts = text_crud.get_texts_for_review(
+    texts = text_crud.get_review_previews(
         db=db, skip=skip, limit=limit, reviewer_id=current_user.id
     )
+    annotation_counts = annotation_crud.count_per_text_ids(
+        db=db, text_ids=[text.id for text in texts]
+    )
     result = []
     for text in texts:
-        annotation_count = len(text.annotations)
         text_data = {
             "id": text.id,
             "title": text.title,
-            "content": text.content[:200] + "..." if len(text.content) > 200 else text.content,
+            "content": _content_preview(text.content_preview),
             "language": text.language,
             "status": text.status,
             "annotator_id": text.annotator_id,
             "created_at": text.created_at,
             "updated_at": text.updated_at,
-            "annotation_count": annotation_count,
+            "annotation_count": annotation_counts.get(text.id, 0),
         }
         result.append(text_data)
-    return result
+    # Plain dicts (datetimes included) that orjson encodes directly
+    return ORJSONResponse(result)
 
 
 def get_my_review_progress(
     db: Session, current_user: User, skip: int = 0, limit: int = 100
-) -> List[dict]:
+) -> ORJSONResponse:
     """Get texts currently assigned to the reviewer for review (in progress)."""
-    texts = (
-        db.query(Text)
-        .options(
-            joinedload(Text.annotator),
-            joinedload(Text.reviewer),
-            joinedload(Text.uploader),
-        )
-        .filter(
-            Text.status == ANNOTATED,
-            Text.reviewer_id == current_user.id,
-            Text.uploaded_by.is_(None),
-        )
-        .offset(skip)
-        .limit(limit)
-        .all()
+    texts = text_crud.get_review_progress_previews(
+        db=db, reviewer_id=current_user.id, skip=skip, limit=limit
+    )
+    text_ids = [text.id for text in texts]
+    annotation_counts = annotation_crud.count_per_text_ids(db=db, text_ids=text_ids)
+    reviewed_counts = annotation_review_crud.count_reviews_by_text_ids(
+        db=db, text_ids=text_ids, reviewer_id=current_user.id
     )
     result = []
     for text in texts:
-        annotation_count = len(text.annotations)
-        existing_reviews = annotation_review_crud.get_reviews_by_text(
-            db=db, text_id=text.id, reviewer_id=current_user.id
-        )
-        reviewed_count = len(existing_reviews)
+        annotation_count = annotation_counts.get(text.id, 0)
+        reviewed_count = reviewed_counts.get(text.id, 0)
         progress_percentage = (
             (reviewed_count / annotation_count * 100) if annotation_count > 0 else 0
         )
         text_data = {
             "id": text.id,
             "title": text.title,
-            "content": text.content[:200] + "..." if len(text.content) > 200 else text.content,
+            "content": _content_preview(text.content_preview),
             "language": text.language,
             "status": text.status,
             "annotator_id": text.annotator_id,
@@ -91,14 +105,14 @@ def get_my_review_progress(
             "is_complete": reviewed_count == annotation_count,
         }
         result.append(text_data)
-    return result
+    return ORJSONResponse(result)
 
 
 def start_review_session(
     db: Session, current_user: User, text_id: int
 ) -> ReviewSessionResponse:
     """Start a review session for a specific text."""
-    text = text_crud.get(db=db, text_id=text_id)
+    text = text_crud.get_state(db=db, text_id=text_id)
     if not text:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -131,7 +145,7 @@ def get_review_status(
     db: Session, current_user: User, text_id: int
 ) -> ReviewStatus:
     """Get review status for a specific text."""
-    text = text_crud.get(db=db, text_id=text_id)
+    text = text_crud.get_state(db=db, text_id=text_id)
     if not text:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -158,56 +172,56 @@ def submit_review(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Text must be in annotated status for review. Current status: {text.status}",
         )
-    review_status = annotation_review_crud.get_review_status(
-        db=db, text_id=review_data.text_id, reviewer_id=current_user.id
+    # Only the total is needed here, not get_review_status's per-reviewer rows
+    total_annotations = annotation_crud.count_by_text_ids(
+        db=db, text_ids=[review_data.text_id]
     )
-    if len(review_data.decisions) != review_status["total_annotations"]:
+    if len(review_data.decisions) != total_annotations:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Must review all annotations. Expected {review_status['total_annotations']}, got {len(review_data.decisions)}",
+            detail=f"Must review all annotations. Expected {total_annotations}, got {len(review_data.decisions)}",
         )
 
+    # Read before the review commits below expire the instance
+    text_title = text.title
     reviews = annotation_review_crud.submit_reviews(
         db=db,
         text_id=review_data.text_id,
         reviewer_id=current_user.id,
         decisions=review_data.decisions,
     )
-    disagreed_count = sum(
-        1 for d in review_data.decisions if d.decision == "disagree"
-    )
-    if disagreed_count > 0:
-        updated_text = text_crud.update_status(
-            db=db,
-            text_id=review_data.text_id,
-            status=REVIEWED_NEEDS_REVISION,
-            reviewer_id=current_user.id,
-        )
-    else:
-        updated_text = text_crud.update_status(
-            db=db,
-            text_id=review_data.text_id,
-            status=REVIEWED,
-            reviewer_id=current_user.id,
-        )
+    disagreed = any(d.decision == "disagree" for d in review_data.decisions)
+    new_status = REVIEWED_NEEDS_REVISION if disagreed else REVIEWED
 
-    next_texts = text_crud.get_texts_for_review(
+    # The status change and the next-text lookup share one transaction. The
+    # text is already loaded, so it is updated in place rather than re-selected,
+    # and the next text is read as plain preview rows that survive the commit.
+    text.status = new_status
+    text.reviewer_id = current_user.id
+    db.flush()
+    next_texts = text_crud.get_review_previews(
         db=db, skip=0, limit=1, reviewer_id=current_user.id
     )
-    next_text = next_texts[0] if next_texts else None
     next_text_data = None
-    if next_text:
+    if next_texts:
+        next_text = next_texts[0]
+        annotation_counts = annotation_crud.count_per_text_ids(
+            db=db, text_ids=[next_text.id]
+        )
         next_text_data = {
             "id": next_text.id,
             "title": next_text.title,
-            "annotation_count": len(next_text.annotations),
+            "annotation_count": annotation_counts.get(next_text.id, 0),
         }
+    db.commit()
+
+    invalidate_stats(TEXT_STATS_KEY, reviewer_stats_key(current_user.id))
 
     return ReviewSubmissionResponse(
-        message=f"Review submitted successfully for text '{text.title}'",
+        message=f"Review submitted successfully for text '{text_title}'",
         text_id=review_data.text_id,
         total_reviews=len(reviews),
-        status=updated_text.status,
+        status=new_status,
         next_review_text=next_text_data,
     )
 
@@ -216,7 +230,7 @@ def review_annotation(
     db: Session, current_user: User, annotation_id: int, review_data: AnnotationReviewCreate
 ):
     """Create or update review for a specific annotation."""
-    if review_data.decision not in ("agree", "disagree"):
+    if review_data.decision not in _REVIEW_DECISIONS:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Decision must be 'agree' or 'disagree'",
@@ -228,6 +242,7 @@ def review_annotation(
         decision=review_data.decision,
         comment=review_data.comment,
     )
+    invalidate_stats(reviewer_stats_key(current_user.id))
     return AnnotationReviewResponse.model_validate(review)
 
 
@@ -238,7 +253,7 @@ def get_annotation_reviews(
     reviews = annotation_review_crud.get_reviews_by_annotation(
         db=db, annotation_id=annotation_id
     )
-    return [AnnotationReviewResponse.model_validate(r) for r in reviews]
+    return _REVIEW_LIST_ADAPTER.validate_python(reviews, from_attributes=True)
 
 
 def get_my_reviews(
@@ -252,36 +267,44 @@ def get_my_reviews(
         .limit(limit)
         .all()
     )
-    return [AnnotationReviewResponse.model_validate(r) for r in reviews]
+    return _REVIEW_LIST_ADAPTER.validate_python(reviews, from_attributes=True)
 
 
 def get_reviewer_stats(db: Session, current_user: User) -> dict:
-    """Get statistics for the current reviewer."""
-    return annotation_review_crud.get_reviewer_stats(
-        db=db, reviewer_id=current_user.id
-    )
+    """Get statistics for the current reviewer (cached for STATS_CACHE_TTL seconds)."""
+    key = reviewer_stats_key(current_user.id)
+    stats = get_cached_stats(key)
+    if stats is None:
+        stats = annotation_review_crud.get_reviewer_stats(
+            db=db, reviewer_id=current_user.id
+        )
+        cache_stats(key, stats)
+    return stats
 
 
 def delete_review(db: Session, current_user: User, review_id: int) -> dict:
     """Delete a review. Only the reviewer who created it can delete."""
-    review = annotation_review_crud.get(db=db, review_id=review_id)
-    if not review:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Review not found",
-        )
-    if review.reviewer_id != current_user.id:
+    deleted_id = annotation_review_crud.delete(
+        db=db, review_id=review_id, reviewer_id=current_user.id
+    )
+    if deleted_id is None:
+        # Nothing deleted; look the review up only to report why
+        if not annotation_review_crud.get(db=db, review_id=review_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Review not found",
+            )
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You can only delete your own reviews",
         )
-    annotation_review_crud.delete(db=db, review_id=review_id)
+    invalidate_stats(reviewer_stats_key(current_user.id))
     return {"message": "Review deleted successfully"}
 
 
 def get_annotator_reviewed_work(
     db: Session, current_user: User, skip: int = 0, limit: int = 100
-) -> List[dict]:
+) -> ORJSONResponse:
     """Get texts that have been reviewed with comments for the current annotator."""
     texts = text_crud.get_texts_by_annotator_with_reviews(
         db=db,
@@ -291,14 +314,12 @@ def get_annotator_reviewed_work(
     )
     result = []
     for text in texts:
-        reviews = annotation_review_crud.get_reviews_for_text_with_comments(
-            db=db, text_id=text.id
+        # Annotations and their reviews come preloaded with the texts
+        decisions = Counter(
+            r.decision for annotation in text.annotations for r in annotation.reviews
         )
-        agree_count = sum(1 for r in reviews if r.decision == "agree")
-        disagree_count = sum(1 for r in reviews if r.decision == "disagree")
         annotations_with_reviews = []
         for annotation in text.annotations:
-            annotation_reviews = [r for r in reviews if r.annotation_id == annotation.id]
             annotations_with_reviews.append({
                 "id": annotation.id,
                 "annotation_type": annotation.annotation_type,
@@ -312,7 +333,7 @@ def get_annotator_reviewed_work(
                         "reviewer_id": r.reviewer_id,
                         "created_at": r.created_at,
                     }
-                    for r in annotation_reviews
+                    for r in annotation.reviews
                 ],
             })
         result.append({
@@ -321,17 +342,17 @@ def get_annotator_reviewed_work(
             "status": text.status,
             "reviewer_id": text.reviewer_id,
             "total_annotations": len(text.annotations),
-            "agree_count": agree_count,
-            "disagree_count": disagree_count,
+            "agree_count": decisions["agree"],
+            "disagree_count": decisions["disagree"],
             "annotations": annotations_with_reviews,
             "reviewed_at": text.updated_at,
         })
-    return result
+    return ORJSONResponse(result)
 
 
 def get_texts_needing_revision(
     db: Session, current_user: User, skip: int = 0, limit: int = 100
-) -> List[dict]:
+) -> ORJSONResponse:
     """Get texts that need revision by the current annotator."""
     texts = text_crud.get_texts_by_annotator_and_status(
         db=db,
@@ -340,24 +361,28 @@ def get_texts_needing_revision(
         skip=skip,
         limit=limit,
     )
+    text_ids = [text.id for text in texts]
+    reviews_by_text = annotation_review_crud.get_reviews_by_text_ids(
+        db=db, text_ids=text_ids
+    )
+    annotation_counts = annotation_crud.count_per_text_ids(db=db, text_ids=text_ids)
     result = []
     for text in texts:
-        reviews = annotation_review_crud.get_reviews_for_text_with_comments(
-            db=db, text_id=text.id
-        )
-        disagree_count = sum(1 for r in reviews if r.decision == "disagree")
-        disagree_comments = [
-            r.comment for r in reviews
-            if r.decision == "disagree" and r.comment
-        ]
+        disagree_count = 0
+        disagree_comments = []
+        for r in reviews_by_text[text.id]:
+            if r.decision == "disagree":
+                disagree_count += 1
+                if r.comment:
+                    disagree_comments.append(r.comment)
         result.append({
             "id": text.id,
             "title": text.title,
             "status": text.status,
             "reviewer_id": text.reviewer_id,
-            "total_annotations": len(text.annotations),
+            "total_annotations": annotation_counts.get(text.id, 0),
             "disagree_count": disagree_count,
             "disagree_comments": disagree_comments,
             "reviewed_at": text.updated_at,
         })
-    return result
+    return ORJSONResponse(result)
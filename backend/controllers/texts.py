@@ -1,11 +1,14 @@
 """Text route actions. All functions take db, current_user, and request data; return result or raise HTTPException."""
 
+import codecs
+import os
 from datetime import datetime
 from typing import List, Optional
 
 from fastapi import HTTPException, status, UploadFile
 from sqlalchemy.orm import Session
 from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
 
 from crud.text import text_crud
 from crud.annotation import annotation_crud
@@ -13,7 +16,7 @@ from crud.annotation_type import annotation_type_crud
 from crud.annotation_list import annotation_list_crud
 from crud.user_rejected_text import user_rejected_text_crud
 from models.user import User
-from models.text import VALID_STATUSES, INITIALIZED, ANNOTATED, REVIEWED, SKIPPED, PROGRESS
+from models.text import Text, VALID_STATUSES, VALID_STATUSES_SET, INITIALIZED, ANNOTATED, REVIEWED, SKIPPED, PROGRESS
 from models.user_rejected_text import UserRejectedText
 from schemas.text import TextCreate, TextUpdate, TaskSubmissionResponse, RecentActivityWithReviewCounts
 from schemas.annotation import AnnotationCreate
@@ -21,20 +24,28 @@ from schemas.combined import TextWithAnnotations
 from schemas.user_rejected_text import RejectedTextWithDetails
 from utils.tei_parser import parse_tei, TEIAnnotation
 from utils.diplomatic_parser import parse_diplomatic_from_tei
+from utils.stats_cache import TEXT_STATS_KEY, cache_stats, get_cached_stats, invalidate_stats
+
+
+# Static, so built once rather than per request
+_STATUS_OPTIONS = {
+    "status_options": VALID_STATUSES,
+    "status_constants": {
+        "INITIALIZED": INITIALIZED,
+        "ANNOTATED": ANNOTATED,
+        "REVIEWED": REVIEWED,
+        "SKIPPED": SKIPPED,
+        "PROGRESS": PROGRESS,
+    },
+}
+
+
+_INVALID_STATUS_DETAIL = f"Invalid status. Must be one of: {', '.join(VALID_STATUSES)}"
 
 
 def get_status_options() -> dict:
     """Return available text status options."""
-    return {
-        "status_options": VALID_STATUSES,
-        "status_constants": {
-            "INITIALIZED": INITIALIZED,
-            "ANNOTATED": ANNOTATED,
-            "REVIEWED": REVIEWED,
-            "SKIPPED": SKIPPED,
-            "PROGRESS": PROGRESS,
-        },
-    }
+    return _STATUS_OPTIONS
 
 
 def read_texts(
@@ -48,11 +59,9 @@ def read_texts(
     uploaded_by: Optional[str] = None,
 ) -> List:
     """Get texts list with optional filtering."""
-    if status is not None and status not in VALID_STATUSES:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid status. Must be one of: {', '.join(VALID_STATUSES)}",
-        )
+    if status is not None and status not in VALID_STATUSES_SET:
+        # The status parameter shadows fastapi.status here
+        raise HTTPException(status_code=400, detail=_INVALID_STATUS_DETAIL)
 
     return text_crud.get_multi(
         db=db,
@@ -65,6 +74,32 @@ def read_texts(
     )
 
 
+# Unique index on texts.title, reported as a duplicate title when violated
+_TITLE_UNIQUE_INDEX = "ix_texts_title"
+
+
+def _create_text(db: Session, current_user: User, text_in: TextCreate) -> Text:
+    """
+    Insert the text; a duplicate title (texts.title is unique) becomes a 400.
+
+    Texts created by the "user" role start assigned to them, in the same INSERT.
+    """
+    assign_to_user_id = current_user.id if current_user.role.value == "user" else None
+    try:
+        return text_crud.create(
+            db=db, obj_in=text_in, assign_to_user_id=assign_to_user_id
+        )
+    except IntegrityError as e:
+        db.rollback()
+        diag = getattr(e.orig, "diag", None)
+        if getattr(diag, "constraint_name", None) == _TITLE_UNIQUE_INDEX:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Text with title '{text_in.title}' already exists",
+            )
+        raise
+
+
 def create_text(db: Session, current_user: User, text_in: TextCreate):
     """Create new text. Only users and admins can create."""
     if current_user.role.value not in ("user", "admin"):
@@ -73,20 +108,42 @@ def create_text(db: Session, current_user: User, text_in: TextCreate):
             detail=f"Role '{current_user.role.value}' is not allowed to create texts",
         )
 
-    existing_text = text_crud.get_by_title(db=db, title=text_in.title)
-    if existing_text:
+    text_in.uploaded_by = current_user.id
+    created_text = _create_text(db, current_user, text_in)
+    invalidate_stats(TEXT_STATS_KEY)
+    return created_text
+
+
+# Largest text/TEI file accepted for upload, and the size of each read from it
+MAX_TEXT_UPLOAD_BYTES = int(os.getenv("MAX_TEXT_UPLOAD_BYTES", str(50 * 1024 * 1024)))
+UPLOAD_READ_CHUNK_SIZE = 64 * 1024
+
+
+def _read_utf8_upload(file: UploadFile, invalid_detail: str) -> str:
+    """Read an uploaded file in chunks, decoding UTF-8 as it goes; 413 past MAX_TEXT_UPLOAD_BYTES."""
+    too_large = HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"File is larger than the {MAX_TEXT_UPLOAD_BYTES} byte upload limit",
+    )
+    if file.size is not None and file.size > MAX_TEXT_UPLOAD_BYTES:
+        raise too_large
+
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pieces: List[str] = []
+    total = 0
+    try:
+        while chunk := file.file.read(UPLOAD_READ_CHUNK_SIZE):
+            total += len(chunk)
+            if total > MAX_TEXT_UPLOAD_BYTES:
+                raise too_large
+            pieces.append(decoder.decode(chunk))
+        pieces.append(decoder.decode(b"", final=True))
+    except UnicodeDecodeError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Text with title '{text_in.title}' already exists",
-        )
-
-    text_in.uploaded_by = current_user.id
-    created_text = text_crud.create(db=db, obj_in=text_in)
-    if current_user.role.value == "user":
-        created_text = text_crud.assign_text_to_user(
-            db=db, text_id=created_text.id, user_id=current_user.id
+            detail=invalid_detail,
         )
-    return created_text
+    return "".join(pieces)
 
 
 def _is_tei_xml(filename: str, content: str) -> bool:
@@ -126,13 +183,7 @@ def upload_text_file(
             detail="Annotation type is required for non-XML uploads",
         )
 
-    try:
-        raw_content = file.file.read().decode("utf-8")
-    except UnicodeDecodeError:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="File must be valid UTF-8 encoded text",
-        )
+    raw_content = _read_utf8_upload(file, "File must be valid UTF-8 encoded text")
 
     filename = file.filename or ""
     tei_annotations: list[TEIAnnotation] = []
@@ -195,11 +246,7 @@ def upload_text_file(
     )
 
     try:
-        created_text = text_crud.create(db=db, obj_in=text_create)
-        if current_user.role.value == "user":
-            created_text = text_crud.assign_text_to_user(
-                db=db, text_id=created_text.id, user_id=current_user.id
-            )
+        created_text = _create_text(db, current_user, text_create)
         # Resolve selected annotation type name for editorial annotations (non-XML path already set above)
         if _is_tei_xml(filename, raw_content) and not selected_type_name and tei_editorial_annotations:
             selected_type_name = "tei_editorial"
@@ -209,9 +256,12 @@ def upload_text_file(
                 selected_type_name = at.name
         # Create POS annotations from TEI annotated layer (output_combined style).
         # Store label as plain value (e.g. n.prop); annotation_type="pos" identifies the type.
-        for ann in tei_annotations:
-            ann_create = AnnotationCreate(
-                text_id=created_text.id,
+        # Spans come straight from the TEI parser (non-empty, in order), so
+        # model_construct skips re-running the AnnotationCreate validators per row
+        text_id = created_text.id
+        annotations_in = [
+            AnnotationCreate.model_construct(
+                text_id=text_id,
                 annotation_type="pos",
                 start_position=ann.start_position,
                 end_position=ann.end_position,
@@ -219,27 +269,28 @@ def upload_text_file(
                 label=ann.label,
                 meta=ann.meta,
             )
-            annotation_crud.create_bulk(
-                db=db, obj_in=ann_create, annotator_id=None
-            )
+            for ann in tei_annotations
+        ]
         # Create editorial annotations (add, unclear, hi, decoration) with selected type (tei.xml style)
         if tei_editorial_annotations and selected_type_name:
             for ann in tei_editorial_annotations:
                 meta = ann.meta or {}
                 if ann.label:
                     meta["tei_element"] = ann.label
-                ann_create = AnnotationCreate(
-                    text_id=created_text.id,
-                    annotation_type=selected_type_name,
-                    start_position=ann.start_position,
-                    end_position=ann.end_position,
-                    selected_text=ann.selected_text,
-                    label=ann.label,
-                    meta=meta,
-                )
-                annotation_crud.create_bulk(
-                    db=db, obj_in=ann_create, annotator_id=None
+                annotations_in.append(
+                    AnnotationCreate.model_construct(
+                        text_id=text_id,
+                        annotation_type=selected_type_name,
+                        start_position=ann.start_position,
+                        end_position=ann.end_position,
+                        selected_text=ann.selected_text,
+                        label=ann.label,
+                        meta=meta,
+                    )
                 )
+        annotation_crud.create_bulk(
+            db=db, objs_in=annotations_in, annotator_id=None
+        )
         # Attach annotation types for frontend filter selection (XML upload only)
         types_created: List[str] = []
         if tei_annotations:
@@ -250,6 +301,8 @@ def upload_text_file(
         if types_created:
             setattr(created_text, "annotation_types_created", types_created)
         return created_text
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -307,36 +360,38 @@ def get_my_rejected_texts(db: Session, current_user: User) -> List[RejectedTextW
     rejected_texts = user_rejected_text_crud.get_user_rejected_texts(
         db=db, user_id=current_user.id
     )
-    result = []
-    for rejection in rejected_texts:
-        text = text_crud.get(db=db, text_id=rejection.text_id)
-        if text:
-            result.append(
-                RejectedTextWithDetails(
-                    id=rejection.id,
-                    text_id=text.id,
-                    text_title=text.title,
-                    text_language=text.language,
-                    rejected_at=rejection.rejected_at,
-                )
-            )
-    return result
+    return [
+        RejectedTextWithDetails(
+            id=rejection.id,
+            text_id=text.id,
+            text_title=text.title,
+            text_language=text.language,
+            rejected_at=rejection.rejected_at,
+        )
+        for rejection, text in rejected_texts
+    ]
 
 
 def get_admin_text_statistics(db: Session, current_user: User) -> dict:
     """Get comprehensive text statistics for admins."""
-    from models.user import User as UserModel
-
     stats = text_crud.get_stats(db)
-    total_rejections = db.query(UserRejectedText).count()
-    unique_rejected_texts = db.query(UserRejectedText.text_id).distinct().count()
-    total_users = db.query(UserModel).filter(UserModel.is_active == True).count()
-    heavily_rejected_texts = (
-        db.query(UserRejectedText.text_id)
+    total_users = (
+        db.query(func.count(User.id)).filter(User.is_active == True).scalar()
+    )
+    # All three rejection counts come from one scan, grouped per text
+    rejections_per_text = (
+        db.query(func.count(UserRejectedText.user_id).label("rejections"))
         .group_by(UserRejectedText.text_id)
-        .having(func.count(UserRejectedText.user_id) >= max(1, total_users * 0.5))
-        .count()
+        .subquery()
     )
+    total_rejections, unique_rejected_texts, heavily_rejected_texts = db.query(
+        func.coalesce(func.sum(rejections_per_text.c.rejections), 0),
+        func.count(),
+        func.count().filter(
+            rejections_per_text.c.rejections >= max(1, total_users * 0.5)
+        ),
+    ).select_from(rejections_per_text).one()
+    total_rejections = int(total_rejections)
     return {
         **stats,
         "total_rejections": total_rejections,
@@ -351,21 +406,18 @@ def get_admin_text_statistics(db: Session, current_user: User) -> dict:
 
 def cancel_work(db: Session, current_user: User, text_id: int) -> dict:
     """Cancel work on a text."""
-    text = text_crud.get(db=db, text_id=text_id)
-    if not text:
+    cancelled = text_crud.cancel_work(db=db, text_id=text_id, user_id=current_user.id)
+    if not cancelled and not text_crud.get_state(db=db, text_id=text_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Text not found",
         )
-    text_crud.cancel_work(db=db, text_id=text_id, user_id=current_user.id)
     return {"message": "Work cancelled successfully"}
 
 
 def revert_work(db: Session, current_user: User, text_id: int) -> dict:
     """Revert user work: remove all user annotations and make text available."""
-    from crud.annotation import annotation_crud
-
-    text = text_crud.get(db=db, text_id=text_id)
+    text = text_crud.get_state(db=db, text_id=text_id)
     if not text:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -396,26 +448,30 @@ def get_my_work_in_progress(db: Session, current_user: User) -> List:
 
 def submit_task(db: Session, current_user: User, text_id: int) -> TaskSubmissionResponse:
     """Submit completed task and optionally get next task."""
-    text = text_crud.get(db=db, text_id=text_id)
-    if not text:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Text not found",
-        )
-    if text.annotator_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You can only submit tasks you are assigned to",
-        )
-    if text.status != PROGRESS:
+    submitted_task = text_crud.update_status(
+        db=db,
+        text_id=text_id,
+        status=ANNOTATED,
+        where=(Text.annotator_id == current_user.id, Text.status == PROGRESS),
+    )
+    if submitted_task is None:
+        # Nothing updated; look the text up only to report why
+        text = text_crud.get_state(db=db, text_id=text_id)
+        if not text:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Text not found",
+            )
+        if text.annotator_id != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You can only submit tasks you are assigned to",
+            )
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Text must be in progress status to submit. Current status: {text.status}",
         )
-
-    submitted_task = text_crud.update_status(
-        db=db, text_id=text_id, status=ANNOTATED
-    )
+    invalidate_stats(TEXT_STATS_KEY)
     next_task = text_crud.start_work(
         db=db, user_id=current_user.id, user_role=current_user.role.value
     )
@@ -434,25 +490,33 @@ def submit_task(db: Session, current_user: User, text_id: int) -> TaskSubmission
 
 def update_task(db: Session, current_user: User, text_id: int):
     """Update a completed task (edit previously submitted work)."""
-    text = text_crud.get(db=db, text_id=text_id)
-    if not text:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Text not found",
-        )
-    if text.annotator_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You can only update tasks you were assigned to",
-        )
-    if text.status not in (ANNOTATED, REVIEWED):
+    updated_task = text_crud.update_status(
+        db=db,
+        text_id=text_id,
+        status=ANNOTATED,
+        where=(
+            Text.annotator_id == current_user.id,
+            Text.status.in_((ANNOTATED, REVIEWED)),
+        ),
+    )
+    if updated_task is None:
+        # Nothing updated; look the text up only to report why
+        text = text_crud.get_state(db=db, text_id=text_id)
+        if not text:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Text not found",
+            )
+        if text.annotator_id != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You can only update tasks you were assigned to",
+            )
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Can only update completed tasks. Current status: {text.status}",
         )
-    return text_crud.update_status(
-        db=db, text_id=text_id, status=ANNOTATED
-    )
+    return updated_task
 
 
 def get_texts_for_review(
@@ -465,8 +529,12 @@ def get_texts_for_review(
 
 
 def get_text_stats(db: Session, current_user: User) -> dict:
-    """Get text statistics."""
-    return text_crud.get_stats(db=db)
+    """Get text statistics (cached for STATS_CACHE_TTL seconds)."""
+    stats = get_cached_stats(TEXT_STATS_KEY)
+    if stats is None:
+        stats = text_crud.get_stats(db=db)
+        cache_stats(TEXT_STATS_KEY, stats)
+    return stats
 
 
 def get_recent_activity(
@@ -525,14 +593,7 @@ def parse_diplomatic_file(file: UploadFile) -> dict:
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="File must be TEI XML (.xml)",
         )
-    raw = file.file.read()
-    try:
-        content = raw.decode("utf-8")
-    except UnicodeDecodeError:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="File must be UTF-8 encoded",
-        )
+    content = _read_utf8_upload(file, "File must be UTF-8 encoded")
     try:
         diplomatic_text = parse_diplomatic_from_tei(content)
     except ValueError as e:
@@ -571,24 +632,24 @@ def update_text_status(
     db: Session, current_user: User, text_id: int, new_status: str
 ):
     """Update text status (reviewer only)."""
-    if new_status not in VALID_STATUSES:
+    if new_status not in VALID_STATUSES_SET:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid status. Must be one of: {', '.join(VALID_STATUSES)}",
-        )
-    text = text_crud.get(db=db, text_id=text_id)
-    if not text:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Text not found",
+            detail=_INVALID_STATUS_DETAIL,
         )
     reviewer_id = current_user.id if new_status == REVIEWED else None
-    return text_crud.update_status(
+    text = text_crud.update_status(
         db=db,
         text_id=text_id,
         status=new_status,
         reviewer_id=reviewer_id,
     )
+    if not text:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Text not found",
+        )
+    return text
 
 
 def delete_text(db: Session, current_user: User, text_id: int) -> None:
@@ -604,16 +665,18 @@ def delete_text(db: Session, current_user: User, text_id: int) -> None:
 
 def soft_delete_my_text(db: Session, current_user: User, text_id: int):
     """Soft delete a text that the current user uploaded (user only)."""
-    text = text_crud.get(db=db, text_id=text_id)
-    if not text:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Text not found",
-        )
-    if text.uploaded_by != current_user.id:
+    deleted_id = text_crud.soft_delete(
+        db=db, text_id=text_id, where=(Text.uploaded_by == current_user.id,)
+    )
+    if deleted_id is None:
+        # Nothing deleted; look the text up only to report why
+        if not text_crud.get_state(db=db, text_id=text_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Text not found",
+            )
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You can only delete texts you uploaded",
         )
-    text_crud.soft_delete(db=db, text_id=text_id)
     return {"message": "Text deleted successfully"}
@@ -6,6 +6,7 @@ from typing import List, Optional
 from fastapi import HTTPException, status
 
 from auth import get_auth0_debug_info
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from crud.user import user_crud
@@ -29,6 +30,29 @@ def get_me(current_user: User) -> User:
     return current_user
 
 
+# Unique indexes on users, mapped to the error reported when an update violates them
+_UNIQUE_VIOLATION_DETAILS = {
+    "ix_users_username": "Username already taken",
+    "ix_users_email": "Email already taken",
+}
+
+
+def _update_user(db: Session, user: User, user_in: UserUpdate) -> User:
+    """Apply the update, letting the unique indexes reject a taken username or email."""
+    try:
+        return user_crud.update(db=db, db_obj=user, obj_in=user_in)
+    except IntegrityError as e:
+        db.rollback()
+        diag = getattr(e.orig, "diag", None)
+        detail = _UNIQUE_VIOLATION_DETAILS.get(getattr(diag, "constraint_name", None))
+        if detail:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=detail,
+            )
+        raise
+
+
 def update_me(db: Session, current_user: User, user_in: UserUpdate) -> User:
     """Update current user info. Users cannot change role or is_active."""
     if user_in.role is not None:
@@ -36,18 +60,7 @@ def update_me(db: Session, current_user: User, user_in: UserUpdate) -> User:
     if user_in.is_active is not None:
         user_in.is_active = None
 
-    if user_in.username and user_crud.is_username_taken(db, user_in.username, current_user.id):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Username already taken",
-        )
-    if user_in.email and user_crud.is_email_taken(db, user_in.email, current_user.id):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already taken",
-        )
-
-    return user_crud.update(db=db, db_obj=current_user, obj_in=user_in)
+    return _update_user(db, current_user, user_in)
 
 
 def list_users(
@@ -57,6 +70,7 @@ def list_users(
     limit: int = 100,
     is_active: Optional[bool] = None,
     role: Optional[UserRole] = None,
+    after_id: Optional[int] = None,
 ) -> List[User]:
     """Get users list (admin only)."""
     return user_crud.get_multi(
@@ -65,6 +79,7 @@ def list_users(
         limit=limit,
         is_active=is_active,
         role=role,
+        after_id=after_id,
     )
 
 
@@ -90,18 +105,7 @@ def update_user(
             detail="User not found",
         )
 
-    if user_in.username and user_crud.is_username_taken(db, user_in.username, user_id):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Username already taken",
-        )
-    if user_in.email and user_crud.is_email_taken(db, user_in.email, user_id):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already taken",
-        )
-
-    return user_crud.update(db=db, db_obj=user, obj_in=user_in)
+    return _update_user(db, user, user_in)
 
 
 def delete_user(db: Session, current_user: User, user_id: int) -> None:
@@ -123,10 +127,10 @@ def delete_user(db: Session, current_user: User, user_id: int) -> None:
 
 
 def search_users(
-    db: Session, current_user: User, q: str, skip: int = 0, limit: int = 100
+    db: Session, current_user: User, q: str, skip: int = 0, limit: int = 100, after_id: Optional[int] = None
 ) -> List[User]:
     """Search users (admin only)."""
-    return user_crud.search(db=db, query=q, skip=skip, limit=limit)
+    return user_crud.search(db=db, query=q, skip=skip, limit=limit, after_id=after_id)
 
 
 def debug_auth0_integration(access_token: str) -> dict:
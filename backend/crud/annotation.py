@@ -1,17 +1,21 @@
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, exists, delete, insert, select, update
+from sqlalchemy.engine import Row
+from database import strict_load
 from models.annotation import Annotation
 from models.text import Text, INITIALIZED, ANNOTATED, PROGRESS
 from models.annotation_review import AnnotationReview
 from schemas.annotation import AnnotationCreate, AnnotationUpdate
 
 
+# Largest value of a PostgreSQL integer (int4)
+INT4_MAX = 2**31 - 1
+
+
 class AnnotationCRUD:
     def create(self, db: Session, obj_in: AnnotationCreate, annotator_id: int) -> Annotation:
         """Create a new annotation."""
-        from models.text import Text, PROGRESS, INITIALIZED
-        
         db_obj = Annotation(
             text_id=obj_in.text_id,
             annotator_id=annotator_id,
@@ -27,52 +31,109 @@ class AnnotationCRUD:
         )
         db.add(db_obj)
         
-        # Update text status to progress if it was initialized  
-        text = db.query(Text).filter(Text.id == obj_in.text_id).first()
-        if text and text.status == INITIALIZED:
-            text.status = PROGRESS
-            db.add(text)
+        # Update text status to progress if it was initialized, without fetching it
+        db.execute(
+            update(Text)
+            .where(Text.id == obj_in.text_id, Text.status == INITIALIZED)
+            .values(status=PROGRESS)
+        )
         
         db.commit()
         db.refresh(db_obj)
         return db_obj
 
-    def create_bulk(self, db: Session, obj_in: AnnotationCreate, annotator_id: Optional[int]) -> Annotation:
-        """Create a new annotation without changing text status (for bulk upload)."""
-        db_obj = Annotation(
-            text_id=obj_in.text_id,
-            annotator_id=annotator_id,  # Can be None for system annotations
-            annotation_type=obj_in.annotation_type,
-            start_position=obj_in.start_position,
-            end_position=obj_in.end_position,
-            selected_text=obj_in.selected_text,
-            label=obj_in.label,
-            name=obj_in.name,
-            level=obj_in.level,
-            meta=obj_in.meta,
-            confidence=obj_in.confidence,
-        )
-        db.add(db_obj)
+    def create_bulk(
+        self, db: Session, objs_in: List[AnnotationCreate], annotator_id: Optional[int]
+    ) -> int:
+        """
+        Create annotations in one executemany INSERT without changing text status
+        (for bulk upload). Returns the number of annotations created.
+        """
+        if not objs_in:
+            return 0
+        rows = [
+            {
+                "text_id": obj_in.text_id,
+                "annotator_id": annotator_id,  # Can be None for system annotations
+                "annotation_type": obj_in.annotation_type,
+                "start_position": obj_in.start_position,
+                "end_position": obj_in.end_position,
+                "selected_text": obj_in.selected_text,
+                "label": obj_in.label,
+                "name": obj_in.name,
+                "level": obj_in.level,
+                "meta": obj_in.meta,
+                "confidence": obj_in.confidence,
+            }
+            for obj_in in objs_in
+        ]
+        db.execute(insert(Annotation), rows, execution_options={"render_nulls": True})
         # Note: No text status update for bulk operations
         db.commit()
-        db.refresh(db_obj)
-        return db_obj
+        return len(rows)
 
     def get(self, db: Session, annotation_id: int) -> Optional[Annotation]:
         """Get annotation by ID."""
-        annotation = db.query(Annotation).filter(Annotation.id == annotation_id).first()
-        if annotation:
-            # Add is_agreed status
-            annotation.is_agreed = self.is_annotation_agreed(db, annotation_id)
+        annotation, _ = self.get_with_agreement(db, annotation_id)
         return annotation
 
+    def get_with_agreement(
+        self, db: Session, annotation_id: int, for_update: bool = False
+    ) -> Tuple[Optional[Annotation], bool]:
+        """
+        Get an annotation and whether a reviewer has agreed with it, in one query.
+
+        With for_update the annotation row is locked (SELECT ... FOR UPDATE) so
+        the agreement and ownership checks hold until the caller commits.
+        """
+        query = self._query_with_agreement(db).filter(Annotation.id == annotation_id)
+        if for_update:
+            query = query.with_for_update(of=Annotation)
+        row = query.first()
+        if row is None:
+            return None, False
+        annotation, agreed = row
+        annotation.is_agreed = agreed
+        return annotation, agreed
+
+    @staticmethod
+    def _agreed_exists():
+        """EXISTS clause, correlated to Annotation, true when a reviewer agreed with it."""
+        return exists().where(
+            AnnotationReview.annotation_id == Annotation.id,
+            AnnotationReview.decision == "agree"
+        )
+
+    def _query_with_agreement(self, db: Session):
+        """Query (Annotation, is_agreed) rows; is_agreed is an EXISTS over agree reviews."""
+        return db.query(Annotation, self._agreed_exists().label("is_agreed"))
+
+    @staticmethod
+    def _mark_agreed(rows) -> List[Annotation]:
+        """Set is_agreed on each annotation of (Annotation, is_agreed) rows and return the annotations."""
+        annotations = []
+        for annotation, agreed in rows:
+            annotation.is_agreed = agreed
+            annotations.append(annotation)
+        return annotations
+
     def is_annotation_agreed(self, db: Session, annotation_id: int) -> bool:
         """Check if an annotation has been agreed upon by any reviewer."""
-        agreed_review = db.query(AnnotationReview).filter(
-            AnnotationReview.annotation_id == annotation_id,
-            AnnotationReview.decision == "agree"
-        ).first()
-        return agreed_review is not None
+        return db.query(
+            exists().where(
+                AnnotationReview.annotation_id == annotation_id,
+                AnnotationReview.decision == "agree"
+            )
+        ).scalar()
+
+    @staticmethod
+    def _paginate(query, skip: int, limit: int, after_id: Optional[int]):
+        """Order by id and apply keyset (after_id) or offset (skip) pagination."""
+        if after_id is not None:
+            query = query.filter(Annotation.id > after_id)
+        elif skip:
+            query = query.offset(skip)
+        return query.order_by(Annotation.id).limit(limit)
 
     def get_multi(
         self, 
@@ -81,10 +142,16 @@ class AnnotationCRUD:
         limit: int = 100,
         text_id: Optional[int] = None,
         annotator_id: Optional[int] = None,
-        annotation_type: Optional[str] = None
+        annotation_type: Optional[str] = None,
+        after_id: Optional[int] = None
     ) -> List[Annotation]:
-        """Get multiple annotations with optional filtering."""
-        query = db.query(Annotation)
+        """
+        Get multiple annotations with optional filtering, ordered by id.
+
+        Pass after_id (the last id of the previous page) for keyset pagination
+        instead of skip, so deep pages do not scan and discard skipped rows.
+        """
+        query = self._query_with_agreement(db).options(*strict_load())
         
         if text_id:
             query = query.filter(Annotation.text_id == text_id)
@@ -95,47 +162,84 @@ class AnnotationCRUD:
         if annotation_type:
             query = query.filter(Annotation.annotation_type == annotation_type)
         
-        annotations = query.offset(skip).limit(limit).all()
-        
-        # Add is_agreed status for each annotation
-        for annotation in annotations:
-            annotation.is_agreed = self.is_annotation_agreed(db, annotation.id)
-        
-        return annotations
+        return self._mark_agreed(self._paginate(query, skip, limit, after_id).all())
 
     def get_by_text(self, db: Session, text_id: int) -> List[Annotation]:
         """Get all annotations for a specific text."""
-        annotations = db.query(Annotation).filter(Annotation.text_id == text_id).all()
-        
-        # Add is_agreed status for each annotation
-        for annotation in annotations:
-            annotation.is_agreed = self.is_annotation_agreed(db, annotation.id)
-        
-        return annotations
+        return self._mark_agreed(
+            self._query_with_agreement(db)
+            .options(*strict_load())
+            .filter(Annotation.text_id == text_id)
+            .all()
+        )
+
+    def get_export_projection_by_text_ids(
+        self, db: Session, text_ids: List[int]
+    ) -> Dict[int, List[Row]]:
+        """
+        Get the exported columns of several texts' annotations in one query, grouped by text_id.
+
+        Returns plain rows rather than ORM objects: export only reads these columns.
+        """
+        grouped: Dict[int, List[Row]] = {text_id: [] for text_id in text_ids}
+        if not text_ids:
+            return grouped
+        rows = db.execute(
+            select(
+                Annotation.text_id,
+                Annotation.annotation_type,
+                Annotation.start_position,
+                Annotation.end_position,
+                Annotation.label,
+                Annotation.name,
+                Annotation.level,
+                Annotation.selected_text,
+                Annotation.confidence,
+                Annotation.meta,
+            )
+            .where(Annotation.text_id.in_(text_ids))
+            .order_by(Annotation.text_id, Annotation.id)
+        )
+        for row in rows:
+            grouped[row.text_id].append(row)
+        return grouped
 
-    def get_by_annotator(self, db: Session, annotator_id: int, skip: int = 0, limit: int = 100) -> List[Annotation]:
-        """Get annotations by a specific annotator."""
-        annotations = db.query(Annotation).filter(
+    def count_by_text_ids(self, db: Session, text_ids: List[int]) -> int:
+        """Count the annotations of several texts in one query."""
+        if not text_ids:
+            return 0
+        return db.query(func.count(Annotation.id)).filter(
+            Annotation.text_id.in_(text_ids)
+        ).scalar()
+
+    def count_per_text_ids(self, db: Session, text_ids: List[int]) -> Dict[int, int]:
+        """Count the annotations of each of several texts in one query, keyed by text_id."""
+        if not text_ids:
+            return {}
+        return dict(
+            db.query(Annotation.text_id, func.count(Annotation.id))
+            .filter(Annotation.text_id.in_(text_ids))
+            .group_by(Annotation.text_id)
+            .all()
+        )
+
+    def get_by_annotator(
+        self, db: Session, annotator_id: int, skip: int = 0, limit: int = 100, after_id: Optional[int] = None
+    ) -> List[Annotation]:
+        """Get annotations by a specific annotator, ordered by id (see get_multi for after_id)."""
+        query = self._query_with_agreement(db).options(*strict_load()).filter(
             Annotation.annotator_id == annotator_id
-        ).offset(skip).limit(limit).all()
-        
-        # Add is_agreed status for each annotation
-        for annotation in annotations:
-            annotation.is_agreed = self.is_annotation_agreed(db, annotation.id)
-        
-        return annotations
+        )
+        return self._mark_agreed(self._paginate(query, skip, limit, after_id).all())
 
-    def get_by_type(self, db: Session, annotation_type: str, skip: int = 0, limit: int = 100) -> List[Annotation]:
-        """Get annotations by type."""
-        annotations = db.query(Annotation).filter(
+    def get_by_type(
+        self, db: Session, annotation_type: str, skip: int = 0, limit: int = 100, after_id: Optional[int] = None
+    ) -> List[Annotation]:
+        """Get annotations by type, ordered by id (see get_multi for after_id)."""
+        query = self._query_with_agreement(db).options(*strict_load()).filter(
             Annotation.annotation_type == annotation_type
-        ).offset(skip).limit(limit).all()
-        
-        # Add is_agreed status for each annotation
-        for annotation in annotations:
-            annotation.is_agreed = self.is_annotation_agreed(db, annotation.id)
-        
-        return annotations
+        )
+        return self._mark_agreed(self._paginate(query, skip, limit, after_id).all())
 
     def update(self, db: Session, db_obj: Annotation, obj_in: AnnotationUpdate) -> Annotation:
         """Update annotation."""
@@ -151,56 +255,49 @@ class AnnotationCRUD:
 
     def delete(self, db: Session, annotation_id: int) -> Optional[Annotation]:
         """Delete annotation."""
-        obj = db.query(Annotation).filter(Annotation.id == annotation_id).first()
+        obj = db.get(Annotation, annotation_id)
         if obj:
             text_id = obj.text_id
             db.delete(obj)
             
-            # Check if text should be reverted to initialized status
-            remaining_annotations = db.query(Annotation).filter(
-                Annotation.text_id == text_id
-            ).count()
-            
-            if remaining_annotations == 0:
-                text = db.query(Text).filter(Text.id == text_id).first()
-                if text and text.status == ANNOTATED:
-                    text.status = INITIALIZED
-                    db.add(text)
+            # Revert the text to initialized if this was its last annotation
+            # (the session does not autoflush, so exclude the pending delete)
+            db.execute(
+                update(Text)
+                .where(
+                    Text.id == text_id,
+                    Text.status == ANNOTATED,
+                    ~exists().where(Annotation.text_id == text_id, Annotation.id != obj.id),
+                )
+                .values(status=INITIALIZED)
+            )
             
             db.commit()
         return obj
 
     def delete_user_annotations(self, db: Session, text_id: int, annotator_id: int) -> int:
         """Delete all annotations by a specific user for a specific text."""
-        from models.text import Text, INITIALIZED
-        # Get all user annotations for this text
-        user_annotations = db.query(Annotation).filter(
-            Annotation.text_id == text_id,
-            Annotation.annotator_id == annotator_id
+        # Delete all user annotations except those a reviewer has agreed upon;
+        # their reviews go with them through the ON DELETE CASCADE foreign key
+        deleted_ids = db.scalars(
+            delete(Annotation)
+            .where(
+                Annotation.text_id == text_id,
+                Annotation.annotator_id == annotator_id,
+                ~self._agreed_exists(),
+            )
+            .returning(Annotation.id)
         ).all()
         
-        # Delete all user annotations (except agreed ones)
-        deleted_count = 0
-        for annotation in user_annotations:
-            # Check if annotation has been agreed upon by any reviewer
-            if self.is_annotation_agreed(db=db, annotation_id=annotation.id):
-                continue  # Skip deletion of agreed annotations
-            db.delete(annotation)
-            deleted_count += 1
-        
-        # Check if we should revert text status
-        remaining_annotations = db.query(Annotation).filter(
-            Annotation.text_id == text_id
-        ).count() - deleted_count
-        if remaining_annotations == 0:
-            text = db.query(Text).filter(Text.id == text_id).first()
-            if text:
-                text.status = INITIALIZED
-                text.annotator_id = None  # Remove annotator assignment
-                db.add(text)
+        # Revert the text and remove the annotator assignment if nothing remains
+        db.execute(
+            update(Text)
+            .where(Text.id == text_id, ~exists().where(Annotation.text_id == text_id))
+            .values(status=INITIALIZED, annotator_id=None)
+        )
         
         db.commit()
-        return deleted_count
+        return len(deleted_ids)
 
     def get_overlapping_annotations(
         self, 
@@ -231,54 +328,63 @@ class AnnotationCRUD:
         exclude_annotation_id: Optional[int] = None
     ) -> dict:
         """Validate annotation positions and return validation result."""
-        # Check if text exists
-        text = db.query(Text).filter(Text.id == text_id).first()
+        result = self.validate_with_text(db, text_id, start_pos, end_pos)
+        result.pop("text")
+        return result
+
+    def validate_with_text(
+        self,
+        db: Session,
+        text_id: int,
+        start_pos: int,
+        end_pos: int,
+    ) -> dict:
+        """
+        Fetch the text once and validate annotation positions against it.
+
+        Returns {"text", "valid", "error"} on failure or {"text", "valid", "selected_text"}
+        on success; "text" is a row of (id, uploaded_by), or None when the text does
+        not exist.
+        """
+        # Only the content length and the selected slice cross the wire, not
+        # the whole content (PostgreSQL counts characters, as len() does).
+        # substr() takes int4 arguments, so clamp them; positions that need
+        # clamping always fail the bounds checks below, which use the originals.
+        substr_start = min(max(start_pos, 0), INT4_MAX - 1) + 1
+        substr_length = min(max(end_pos - start_pos, 0), INT4_MAX)
+        text = db.query(
+            Text.id,
+            Text.uploaded_by,
+            func.length(Text.content).label("content_length"),
+            func.substr(Text.content, substr_start, substr_length).label("selected_text"),
+        ).filter(Text.id == text_id).first()
         if not text:
-            return {"valid": False, "error": "Text not found"}
+            return {"text": None, "valid": False, "error": "Text not found"}
         
         # Check if positions are within text bounds
-        text_length = len(text.content)
+        text_length = text.content_length
         if start_pos < 0 or end_pos < 0:
-            return {"valid": False, "error": "Positions cannot be negative"}
+            return {"text": text, "valid": False, "error": "Positions cannot be negative"}
         
         if start_pos >= text_length:
-            return {"valid": False, "error": f"Start position ({start_pos}) exceeds text length ({text_length})"}
+            return {"text": text, "valid": False, "error": f"Start position ({start_pos}) exceeds text length ({text_length})"}
         
         if end_pos > text_length:
-            return {"valid": False, "error": f"End position ({end_pos}) exceeds text length ({text_length})"}
+            return {"text": text, "valid": False, "error": f"End position ({end_pos}) exceeds text length ({text_length})"}
         
         if start_pos >= end_pos:
-            return {"valid": False, "error": "Start position must be less than end position"}
-        
-        # Extract the selected text
-        selected_text = text.content[start_pos:end_pos]
-        
-        # Note: Overlapping annotations are now allowed
-        # overlapping = self.get_overlapping_annotations(
-        #     db, text_id, start_pos, end_pos, exclude_annotation_id
-        # )
-        # 
-        # if overlapping:
-        #     return {
-        #         "valid": False, 
-        #         "error": f"Annotation overlaps with existing annotation(s): {[ann.id for ann in overlapping]}"
-        #     }
+            return {"text": text, "valid": False, "error": "Start position must be less than end position"}
         
+        # Note: Overlapping annotations are allowed, so no overlap check here
         return {
+            "text": text,
             "valid": True, 
-            "selected_text": selected_text
+            "selected_text": text.selected_text
         }
 
     def get_annotation_stats(self, db: Session, text_id: Optional[int] = None) -> dict:
         """Get annotation statistics."""
-        query = db.query(Annotation)
-        
-        if text_id:
-            query = query.filter(Annotation.text_id == text_id)
-        
-        total_annotations = query.count()
-        
-        # Get count by annotation type
+        # Count by annotation type; the total is their sum, so one query serves both
         type_counts = db.query(
             Annotation.annotation_type,
             func.count(Annotation.id).label('count')
@@ -287,11 +393,11 @@ class AnnotationCRUD:
         if text_id:
             type_counts = type_counts.filter(Annotation.text_id == text_id)
         
-        type_counts = type_counts.group_by(Annotation.annotation_type).all()
+        by_type = {item.annotation_type: item.count for item in type_counts.group_by(Annotation.annotation_type)}
         
         return {
-            "total_annotations": total_annotations,
-            "by_type": {item.annotation_type: item.count for item in type_counts}
+            "total_annotations": sum(by_type.values()),
+            "by_type": by_type
         }
 
 
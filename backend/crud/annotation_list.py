@@ -1,9 +1,10 @@
 from typing import List, Optional, Dict, Any, Set
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 import uuid
 from models.annotation_list import AnnotationList
 from models.annotation_type import AnnotationType
-from schemas.annotation_list import AnnotationListCreate, CategoryInput, CategoryOutput, HierarchicalJSONOutput
+from schemas.annotation_list import AnnotationListCreate, AnnotationListUpdate, CategoryInput, CategoryOutput, HierarchicalJSONOutput
 from crud.annotation_type import annotation_type_crud
 
 
@@ -35,11 +36,10 @@ class AnnotationListCRUD:
     
     def get(self, db: Session, list_id: str) -> Optional[AnnotationList]:
         """Get annotation list by ID."""
-        return db.query(AnnotationList).filter(AnnotationList.id == list_id).first()
+        return db.get(AnnotationList, list_id)
     
     def update(self, db: Session, db_obj: AnnotationList, obj_in) -> AnnotationList:
         """Update annotation list item."""
-        from schemas.annotation_list import AnnotationListUpdate
         update_data = obj_in.model_dump(exclude_unset=True)
         
         # Handle parent_id update - validate it's not creating a circular reference
@@ -67,7 +67,7 @@ class AnnotationListCRUD:
     
     def _is_descendant(self, db: Session, ancestor_id: str, potential_descendant_id: str) -> bool:
         """Check if potential_descendant_id is a descendant of ancestor_id."""
-        current = db.query(AnnotationList).filter(AnnotationList.id == potential_descendant_id).first()
+        current = db.get(AnnotationList, potential_descendant_id)
         if not current:
             return False
         
@@ -78,7 +78,7 @@ class AnnotationListCRUD:
             if current.parent_id in visited:
                 break  # Prevent infinite loops
             visited.add(current.parent_id)
-            current = db.query(AnnotationList).filter(AnnotationList.id == current.parent_id).first()
+            current = db.get(AnnotationList, current.parent_id)
         
         return False
 
@@ -147,7 +147,7 @@ class AnnotationListCRUD:
     
     def delete(self, db: Session, list_id: str) -> bool:
         """Delete annotation list by ID (CASCADE will handle children)."""
-        obj = db.query(AnnotationList).filter(AnnotationList.id == list_id).first()
+        obj = db.get(AnnotationList, list_id)
         if obj:
             db.delete(obj)
             db.commit()
@@ -177,7 +177,11 @@ class AnnotationListCRUD:
         root_metadata: Optional[Dict[str, Any]] = None
     ) -> List[str]:
         """
-        Recursively create annotation list records from hierarchical categories.
+        Create annotation list records from hierarchical categories.
+        
+        The tree is flattened into one batch of rows per depth level and each
+        level is written with a single executemany INSERT, parents before
+        children, instead of one INSERT per node.
         
         Args:
             db: Database session
@@ -188,79 +192,84 @@ class AnnotationListCRUD:
             root_metadata: Metadata from root (version, copyright, etc.) for first item
         
         Returns:
-            List of created record IDs
+            List of created record IDs (depth-first, in input order)
         """
-        created_ids = []
-        
         # Get or create the annotation type
         annotation_type = annotation_type_crud.get_or_create(db=db, name=root_type, uploader_id=created_by)
         type_id = annotation_type.id
         
-        for idx, category in enumerate(categories):
-            # Extract fields for meta
-            meta_fields = {}
-            
-            # Store original ID if exists
-            if category.id:
-                meta_fields['original_id'] = category.id
-            
-            # Store mnemonic if exists
-            if category.mnemonic:
-                meta_fields['mnemonic'] = category.mnemonic
-            
-            # Store examples if exists
-            if category.examples:
-                meta_fields['examples'] = category.examples
-            
-            # Store notes if exists
-            if category.notes:
-                meta_fields['notes'] = category.notes
-            
-            # Store parent reference from original JSON if exists
-            if category.parent:
-                meta_fields['original_parent'] = category.parent
-            
-            # Add any extra fields that weren't explicitly handled
-            category_dict = category.model_dump()
-            excluded_fields = {'name', 'description', 'level', 'subcategories', 
-                             'id', 'mnemonic', 'examples', 'notes', 'parent'}
-            for key, value in category_dict.items():
-                if key not in excluded_fields and value is not None:
-                    meta_fields[key] = value
-            
-            # Add root metadata to first root item only
-            if parent_id is None and idx == 0 and root_metadata:
-                meta_fields.update(root_metadata)
-            
-            # Create the record
-            record_id = category.id or str(uuid.uuid4())
-            db_obj = AnnotationList(
-                id=record_id,
-                type_id=type_id,
-                title=category.name,
-                level=str(category.level) if category.level is not None else None,
-                parent_id=parent_id,
-                description=category.description,
-                created_by=created_by,
-                meta=meta_fields if meta_fields else None
-            )
-            db.add(db_obj)
-            created_ids.append(record_id)
-            
-            # Recursively process subcategories if they exist
-            if category.subcategories:
-                child_ids = self.create_hierarchical(
-                    db=db,
-                    categories=category.subcategories,
-                    root_type=root_type,
-                    created_by=created_by,
-                    parent_id=record_id,
-                    root_metadata=None  # Only pass to first root
-                )
-                created_ids.extend(child_ids)
+        created_ids: List[str] = []
+        rows_by_depth: List[List[Dict[str, Any]]] = []
+        
+        def collect(items: List[CategoryInput], item_parent_id: Optional[str], depth: int) -> None:
+            if len(rows_by_depth) <= depth:
+                rows_by_depth.append([])
+            for idx, category in enumerate(items):
+                meta_fields = self._category_meta(category)
+                
+                # Add root metadata to first root item only
+                if item_parent_id is None and idx == 0 and root_metadata:
+                    meta_fields.update(root_metadata)
+                
+                record_id = category.id or str(uuid.uuid4())
+                rows_by_depth[depth].append({
+                    "id": record_id,
+                    "type_id": type_id,
+                    "title": category.name,
+                    "level": str(category.level) if category.level is not None else None,
+                    "parent_id": item_parent_id,
+                    "description": category.description,
+                    "created_by": created_by,
+                    "meta": meta_fields if meta_fields else None,
+                })
+                created_ids.append(record_id)
+                
+                if category.subcategories:
+                    collect(category.subcategories, record_id, depth + 1)
+        
+        collect(categories, parent_id, 0)
+        
+        for rows in rows_by_depth:
+            if rows:
+                db.execute(insert(AnnotationList), rows)
         
         return created_ids
     
+    @staticmethod
+    def _category_meta(category: CategoryInput) -> Dict[str, Any]:
+        """Collect the fields of a category that are stored in meta."""
+        meta_fields = {}
+        
+        # Store original ID if exists
+        if category.id:
+            meta_fields['original_id'] = category.id
+        
+        # Store mnemonic if exists
+        if category.mnemonic:
+            meta_fields['mnemonic'] = category.mnemonic
+        
+        # Store examples if exists
+        if category.examples:
+            meta_fields['examples'] = category.examples
+        
+        # Store notes if exists
+        if category.notes:
+            meta_fields['notes'] = category.notes
+        
+        # Store parent reference from original JSON if exists
+        if category.parent:
+            meta_fields['original_parent'] = category.parent
+        
+        # Add any extra fields that weren't explicitly handled
+        category_dict = category.model_dump()
+        excluded_fields = {'name', 'description', 'level', 'subcategories', 
+                         'id', 'mnemonic', 'examples', 'notes', 'parent'}
+        for key, value in category_dict.items():
+            if key not in excluded_fields and value is not None:
+                meta_fields[key] = value
+        
+        return meta_fields
+    
     def reconstruct_hierarchy(self, items: List[AnnotationList]) -> HierarchicalJSONOutput:
         """
         Reconstruct hierarchical JSON structure from flat database records.
@@ -1,6 +1,6 @@
 from typing import List, Optional, Dict, Any
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
+from sqlalchemy import func, and_, delete
 from models.annotation_review import AnnotationReview
 from models.annotation import Annotation
 from models.text import Text
@@ -24,7 +24,7 @@ class AnnotationReviewCRUD:
 
     def get(self, db: Session, review_id: int) -> Optional[AnnotationReview]:
         """Get annotation review by ID."""
-        return db.query(AnnotationReview).filter(AnnotationReview.id == review_id).first()
+        return db.get(AnnotationReview, review_id)
 
     def get_by_annotation_and_reviewer(
         self, db: Session, annotation_id: int, reviewer_id: int
@@ -46,6 +46,24 @@ class AnnotationReviewCRUD:
             )
         ).all()
 
+    def count_reviews_by_text_ids(
+        self, db: Session, text_ids: List[int], reviewer_id: int
+    ) -> Dict[int, int]:
+        """Count a reviewer's reviews for several texts in one query, keyed by text_id."""
+        if not text_ids:
+            return {}
+        return dict(
+            db.query(Annotation.text_id, func.count(AnnotationReview.id))
+            .select_from(AnnotationReview)
+            .join(Annotation)
+            .filter(
+                Annotation.text_id.in_(text_ids),
+                AnnotationReview.reviewer_id == reviewer_id,
+            )
+            .group_by(Annotation.text_id)
+            .all()
+        )
+
     def get_reviews_by_annotation(self, db: Session, annotation_id: int) -> List[AnnotationReview]:
         """Get all reviews for a specific annotation."""
         return db.query(AnnotationReview).filter(
@@ -66,13 +84,14 @@ class AnnotationReviewCRUD:
         db.refresh(db_obj)
         return db_obj
 
-    def delete(self, db: Session, review_id: int) -> Optional[AnnotationReview]:
-        """Delete annotation review."""
-        obj = db.query(AnnotationReview).filter(AnnotationReview.id == review_id).first()
-        if obj:
-            db.delete(obj)
-            db.commit()
-        return obj
+    def delete(self, db: Session, review_id: int, reviewer_id: Optional[int] = None) -> Optional[int]:
+        """Delete annotation review (only if it is reviewer_id's, when given) in one DELETE; returns its id, or None if none matched."""
+        query = delete(AnnotationReview).where(AnnotationReview.id == review_id)
+        if reviewer_id is not None:
+            query = query.where(AnnotationReview.reviewer_id == reviewer_id)
+        deleted_id = db.execute(query.returning(AnnotationReview.id)).scalar_one_or_none()
+        db.commit()
+        return deleted_id
 
     def create_or_update_review(
         self, db: Session, annotation_id: int, reviewer_id: int, decision: str, comment: Optional[str] = None
@@ -135,7 +154,7 @@ class AnnotationReviewCRUD:
     def get_review_session_data(self, db: Session, text_id: int, reviewer_id: int) -> Dict[str, Any]:
         """Get comprehensive review session data."""
         # Get text with annotations
-        text = db.query(Text).filter(Text.id == text_id).first()
+        text = db.get(Text, text_id)
         if not text:
             return None
         
@@ -227,6 +246,20 @@ class AnnotationReviewCRUD:
             Annotation.text_id == text_id
         ).all()
 
+    def get_reviews_by_text_ids(
+        self, db: Session, text_ids: List[int]
+    ) -> Dict[int, List[AnnotationReview]]:
+        """Get all reviews for annotations of several texts in one query, grouped by text_id."""
+        grouped: Dict[int, List[AnnotationReview]] = {text_id: [] for text_id in text_ids}
+        if not text_ids:
+            return grouped
+        rows = db.query(AnnotationReview, Annotation.text_id).join(Annotation).filter(
+            Annotation.text_id.in_(text_ids)
+        ).all()
+        for review, text_id in rows:
+            grouped[text_id].append(review)
+        return grouped
+
 
 # Create a global instance
 annotation_review_crud = AnnotationReviewCRUD() 
\ No newline at end of file
@@ -22,7 +22,7 @@ class AnnotationTypeCRUD:
     
     def get(self, db: Session, type_id: str) -> Optional[AnnotationType]:
         """Get annotation type by ID."""
-        return db.query(AnnotationType).filter(AnnotationType.id == type_id).first()
+        return db.get(AnnotationType, type_id)
     
     def get_by_name(self, db: Session, name: str) -> Optional[AnnotationType]:
         """Get annotation type by name."""
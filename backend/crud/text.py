@@ -1,15 +1,24 @@
-from typing import List, Optional
+from typing import List, Optional, Set
 from datetime import datetime, timezone
-from sqlalchemy.orm import Session, joinedload, defer
-from sqlalchemy import func, and_, exists, select
-from models.text import Text, INITIALIZED, ANNOTATED, REVIEWED, REVIEWED_NEEDS_REVISION, SKIPPED, PROGRESS, VALID_STATUSES
+from sqlalchemy.orm import Session, joinedload, defer, selectinload
+from sqlalchemy import func, and_, exists, select, update
+from sqlalchemy.engine import Row
+from models.text import Text, INITIALIZED, ANNOTATED, REVIEWED, REVIEWED_NEEDS_REVISION, SKIPPED, PROGRESS, VALID_STATUSES, VALID_STATUSES_SET
 from models.annotation import Annotation
+from models.annotation_review import AnnotationReview
+from models.user_rejected_text import UserRejectedText
+from crud.user_rejected_text import user_rejected_text_crud
 from schemas.text import TextCreate, TextListResponse, TextUpdate
 
+# Characters of content shown in text listings
+CONTENT_PREVIEW_LENGTH = 200
+
 
 class TextCRUD:
-    def create(self, db: Session, obj_in: TextCreate) -> Text:
-        """Create a new text."""
+    def create(
+        self, db: Session, obj_in: TextCreate, assign_to_user_id: Optional[int] = None
+    ) -> Text:
+        """Create a new text. With assign_to_user_id it starts assigned to that user in progress (see assign_text_to_user)."""
         db_obj = Text(
             title=obj_in.title,
             content=obj_in.content,
@@ -20,6 +29,9 @@ class TextCRUD:
             uploaded_by=obj_in.uploaded_by,
             annotation_type_id=obj_in.annotation_type_id,
         )
+        if assign_to_user_id is not None:
+            db_obj.annotator_id = assign_to_user_id
+            db_obj.status = PROGRESS
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
@@ -49,6 +61,13 @@ class TextCRUD:
         """Get text by title."""
         return self._not_deleted(db.query(Text)).filter(Text.title == title).first()
 
+    def get_existing_titles(self, db: Session, titles: List[str]) -> Set[str]:
+        """Return which of the given titles are already used by a text, in one query."""
+        if not titles:
+            return set()
+        rows = self._not_deleted(db.query(Text.title)).filter(Text.title.in_(titles)).all()
+        return {title for (title,) in rows}
+
     def get_multi(
         self, 
         db: Session, 
@@ -121,7 +140,7 @@ class TextCRUD:
         for field, value in obj_data.items():
             # Validate status if being updated
             if field == 'status' and value is not None:
-                if value not in VALID_STATUSES:
+                if value not in VALID_STATUSES_SET:
                     raise ValueError(f'Status must be one of: {", ".join(VALID_STATUSES)}')
             setattr(db_obj, field, value)
         
@@ -130,38 +149,55 @@ class TextCRUD:
         db.refresh(db_obj)
         return db_obj
 
-    def update_status(self, db: Session, text_id: int, status: str, reviewer_id: Optional[int] = None) -> Optional[Text]:
-        """Update text status."""
-        db_obj = self._not_deleted(db.query(Text)).filter(Text.id == text_id).first()
-        if db_obj:
-            db_obj.status = status
-            if reviewer_id:
-                db_obj.reviewer_id = reviewer_id
-            db.add(db_obj)
-            db.commit()
-            db.refresh(db_obj)
+    def update_status(
+        self, db: Session, text_id: int, status: str, reviewer_id: Optional[int] = None, where=()
+    ) -> Optional[Text]:
+        """
+        Update text status in a single UPDATE ... RETURNING.
+
+        where adds criteria the row must also meet (e.g. its current status). Returns
+        None when no text matched; use get_state to tell the caller why.
+        """
+        values = {"status": status}
+        if reviewer_id:
+            values["reviewer_id"] = reviewer_id
+        db_obj = db.scalars(
+            update(Text)
+            .where(Text.id == text_id, Text.deleted_at.is_(None), *where)
+            .values(**values)
+            .returning(Text)
+        ).one_or_none()
+        db.commit()
         return db_obj
 
+    def get_state(self, db: Session, text_id: int) -> Optional[Row]:
+        """Get the assignment columns (annotator_id, reviewer_id, status, uploaded_by) of a text, without loading it."""
+        return self._not_deleted(
+            db.query(Text.id, Text.annotator_id, Text.reviewer_id, Text.status, Text.uploaded_by)
+        ).filter(Text.id == text_id).first()
+
     def delete(self, db: Session, text_id: int) -> Optional[Text]:
         """Hard delete text (admin only - removes record)."""
-        obj = db.query(Text).filter(Text.id == text_id).first()
+        obj = db.get(Text, text_id)
         if obj:
             db.delete(obj)
             db.commit()
         return obj
 
-    def soft_delete(self, db: Session, text_id: int) -> Optional[Text]:
-        """Soft delete text - set deleted_at timestamp."""
-        obj = db.query(Text).filter(Text.id == text_id).first()
-        if obj:
-            obj.deleted_at = datetime.now(timezone.utc)
-            db.add(obj)
-            db.commit()
-            db.refresh(obj)
-        return obj
+    def soft_delete(self, db: Session, text_id: int, where=()) -> Optional[int]:
+        """Soft delete text - set deleted_at timestamp. Returns its id, or None if no (not deleted) text matched where."""
+        deleted_id = db.execute(
+            update(Text)
+            .where(Text.id == text_id, Text.deleted_at.is_(None), *where)
+            .values(deleted_at=datetime.now(timezone.utc))
+            .returning(Text.id)
+        ).scalar_one_or_none()
+        db.commit()
+        return deleted_id
 
     def search(self, db: Session, query: str, skip: int = 0, limit: int = 100) -> List[Text]:
         """Search texts by title or content."""
+        # Substring match, served by the pg_trgm GIN indexes on title and content
         search_filter = Text.title.contains(query) | Text.content.contains(query)
         return self._not_deleted(db.query(Text)).filter(search_filter).offset(skip).limit(limit).all()
 
@@ -171,7 +207,6 @@ class TextCRUD:
 
     def get_texts_for_annotation(self, db: Session, skip: int = 0, limit: int = 100, user_id: int = None, user_role: str = None) -> List[Text]:
         """Get texts available for annotation (initialized status or needs revision)."""
-        from models.text import REVIEWED_NEEDS_REVISION
         query = self._not_deleted(db.query(Text)).options(
             joinedload(Text.annotator),
             joinedload(Text.reviewer),
@@ -208,6 +243,47 @@ class TextCRUD:
         
         return query.offset(skip).limit(limit).all()
 
+    def get_review_previews(
+        self, db: Session, skip: int = 0, limit: int = 100, reviewer_id: Optional[int] = None
+    ) -> List[Row]:
+        """Like get_texts_for_review, but only the listed columns and a content_preview (see _preview_columns)."""
+        query = self._not_deleted(db.query(*self._preview_columns())).filter(
+            Text.status == ANNOTATED,
+            Text.uploaded_by.is_(None)
+        )
+        if reviewer_id:
+            query = query.filter(Text.annotator_id != reviewer_id)
+        return query.offset(skip).limit(limit).all()
+
+    def get_review_progress_previews(
+        self, db: Session, reviewer_id: int, skip: int = 0, limit: int = 100
+    ) -> List[Row]:
+        """Preview rows (see _preview_columns) of annotated system texts assigned to the reviewer."""
+        return self._not_deleted(db.query(*self._preview_columns(), Text.reviewer_id)).filter(
+            Text.status == ANNOTATED,
+            Text.reviewer_id == reviewer_id,
+            Text.uploaded_by.is_(None)
+        ).offset(skip).limit(limit).all()
+
+    @staticmethod
+    def _preview_columns():
+        """
+        Columns for text listings, with content cut down to content_preview in SQL.
+
+        content_preview holds CONTENT_PREVIEW_LENGTH + 1 characters at most, so a
+        preview longer than CONTENT_PREVIEW_LENGTH means the content was truncated.
+        """
+        return (
+            Text.id,
+            Text.title,
+            func.substr(Text.content, 1, CONTENT_PREVIEW_LENGTH + 1).label("content_preview"),
+            Text.language,
+            Text.status,
+            Text.annotator_id,
+            Text.created_at,
+            Text.updated_at,
+        )
+
     def get_stats(self, db: Session) -> dict:
         """Get text statistics."""
         base = self._not_deleted(db.query(Text))
@@ -256,7 +332,6 @@ class TextCRUD:
 
     def get_unassigned_text_for_user(self, db: Session, user_id: int, user_role: str = None) -> Optional[Text]:
         """Get an unassigned text with initialized status that user hasn't rejected."""
-        from models.user_rejected_text import UserRejectedText
         
         # Get text IDs that user has rejected
         rejected_text_ids = (select(UserRejectedText.text_id).where(UserRejectedText.user_id == user_id))
@@ -332,8 +407,6 @@ class TextCRUD:
 
     def get_recent_activity_with_review_counts(self, db: Session, user_id: int, limit: int = 10, user_role: str = None) -> List[dict]:
         """Get recent texts annotated or reviewed by the user with annotation review counts."""
-        from models.annotation import Annotation
-        from models.annotation_review import AnnotationReview
         
         # Get recent texts
         recent_texts = self.get_recent_activity(db, user_id, limit, user_role)
@@ -394,7 +467,6 @@ class TextCRUD:
         ).count()
         
         # Count total annotations created by user
-        from models.annotation import Annotation
         total_annotations = db.query(Annotation).filter(
             Annotation.annotator_id == user_id
         ).count()
@@ -426,7 +498,6 @@ class TextCRUD:
 
     def skip_text(self, db: Session, user_id: int, user_role: str = None) -> Optional[Text]:
         """Skip current text by adding it to rejected list and get next available text."""
-        from crud.user_rejected_text import user_rejected_text_crud
         
         # Find the current text in progress for the user
         current_text = self.get_work_in_progress(db, user_id)
@@ -451,22 +522,20 @@ class TextCRUD:
 
     def cancel_work(self, db: Session, user_id: int, text_id: int) -> bool:
         """Cancel current work on a text - make it available for others."""
-        text = self._not_deleted(db.query(Text)).filter(
-            Text.id == text_id,
-            Text.annotator_id == user_id,
-            Text.status == PROGRESS
-        ).first()
-        
-        if not text:
-            return False
-        
         # Reset text to make it available for others
-        text.annotator_id = None
-        text.status = INITIALIZED
-        db.add(text)
+        cancelled_id = db.execute(
+            update(Text)
+            .where(
+                Text.id == text_id,
+                Text.deleted_at.is_(None),
+                Text.annotator_id == user_id,
+                Text.status == PROGRESS
+            )
+            .values(annotator_id=None, status=INITIALIZED)
+            .returning(Text.id)
+        ).scalar_one_or_none()
         db.commit()
-        
-        return True
+        return cancelled_id is not None
 
     def get_user_work_in_progress(self, db: Session, user_id: int, user_role: str = None) -> List[Text]:
         """Get all texts that user is currently working on (progress status)."""
@@ -489,10 +558,10 @@ class TextCRUD:
     def get_texts_by_annotator_with_reviews(
         self, db: Session, annotator_id: int, skip: int = 0, limit: int = 100
     ) -> List[Text]:
-        """Get texts annotated by a specific user that have been reviewed."""
-        from models.text import REVIEWED, REVIEWED_NEEDS_REVISION
-        
-        return self._not_deleted(db.query(Text)).filter(
+        """Get texts annotated by a specific user that have been reviewed, with annotations and their reviews loaded."""
+        return self._not_deleted(db.query(Text)).options(
+            selectinload(Text.annotations).selectinload(Annotation.reviews)
+        ).filter(
             Text.annotator_id == annotator_id,
             Text.status.in_([REVIEWED, REVIEWED_NEEDS_REVISION])
         ).offset(skip).limit(limit).all()
@@ -1,8 +1,10 @@
 from typing import List, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy import or_
+from database import strict_load
 from models.user import User
 from schemas.user import UserCreate, UserUpdate
+from utils.user_cache import invalidate_user
 
 
 class UserCRUD:
@@ -23,7 +25,7 @@ class UserCRUD:
 
     def get(self, db: Session, user_id: int) -> Optional[User]:
         """Get user by ID."""
-        return db.query(User).filter(User.id == user_id).first()
+        return db.get(User, user_id)
 
     def get_by_auth0_id(self, db: Session, auth0_user_id: str) -> Optional[User]:
         """Get user by Auth0 user ID."""
@@ -37,16 +39,31 @@ class UserCRUD:
         """Get user by email."""
         return db.query(User).filter(User.email == email).first()
 
+    @staticmethod
+    def _paginate(query, skip: int, limit: int, after_id: Optional[int]):
+        """Order by id and apply keyset (after_id) or offset (skip) pagination."""
+        if after_id is not None:
+            query = query.filter(User.id > after_id)
+        elif skip:
+            query = query.offset(skip)
+        return query.order_by(User.id).limit(limit)
+
     def get_multi(
         self, 
         db: Session, 
         skip: int = 0, 
         limit: int = 100,
         is_active: Optional[bool] = None,
-        role: Optional[str] = None
+        role: Optional[str] = None,
+        after_id: Optional[int] = None
     ) -> List[User]:
-        """Get multiple users with optional filtering."""
-        query = db.query(User)
+        """
+        Get multiple users with optional filtering, ordered by id.
+
+        Pass after_id (the last id of the previous page) for keyset pagination
+        instead of skip.
+        """
+        query = db.query(User).options(*strict_load())
         
         if is_active is not None:
             query = query.filter(User.is_active == is_active)
@@ -54,7 +71,7 @@ class UserCRUD:
         if role:
             query = query.filter(User.role == role)
         
-        return query.offset(skip).limit(limit).all()
+        return self._paginate(query, skip, limit, after_id).all()
 
     def update(self, db: Session, db_obj: User, obj_in: UserUpdate) -> User:
         """Update user."""
@@ -66,24 +83,30 @@ class UserCRUD:
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
+        invalidate_user(db_obj.auth0_user_id)
         return db_obj
 
     def delete(self, db: Session, user_id: int) -> Optional[User]:
         """Delete user."""
-        obj = db.query(User).filter(User.id == user_id).first()
+        obj = db.get(User, user_id)
         if obj:
+            auth0_user_id = obj.auth0_user_id
             db.delete(obj)
             db.commit()
+            invalidate_user(auth0_user_id)
         return obj
 
-    def search(self, db: Session, query: str, skip: int = 0, limit: int = 100) -> List[User]:
-        """Search users by username, email, or full name."""
+    def search(
+        self, db: Session, query: str, skip: int = 0, limit: int = 100, after_id: Optional[int] = None
+    ) -> List[User]:
+        """Search users by username, email, or full name, ordered by id (see get_multi for after_id)."""
         search_filter = or_(
             User.username.contains(query),
             User.email.contains(query) if query else False,
             User.full_name.contains(query) if query else False
         )
-        return db.query(User).filter(search_filter).offset(skip).limit(limit).all()
+        query = db.query(User).options(*strict_load()).filter(search_filter)
+        return self._paginate(query, skip, limit, after_id).all()
 
     def is_username_taken(self, db: Session, username: str, exclude_user_id: Optional[int] = None) -> bool:
         """Check if username is already taken."""
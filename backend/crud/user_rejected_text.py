@@ -1,6 +1,7 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
+from models.text import Text
 from models.user_rejected_text import UserRejectedText
 
 
@@ -21,10 +22,15 @@ class UserRejectedTextCRUD:
             db.rollback()
             return None
 
-    def get_user_rejected_texts(self, db: Session, user_id: int) -> List[UserRejectedText]:
-        """Get all texts rejected by a user."""
-        return db.query(UserRejectedText).filter(
-            UserRejectedText.user_id == user_id
+    def get_user_rejected_texts(
+        self, db: Session, user_id: int
+    ) -> List[Tuple[UserRejectedText, Text]]:
+        """Get all texts rejected by a user, paired with the (not deleted) text itself."""
+        return db.query(UserRejectedText, Text).join(
+            Text, UserRejectedText.text_id == Text.id
+        ).filter(
+            UserRejectedText.user_id == user_id,
+            Text.deleted_at.is_(None)
         ).all()
 
     def get_user_rejected_text_ids(self, db: Session, user_id: int) -> List[int]:
@@ -1,5 +1,6 @@
 # main.py
 import os
+import anyio.to_thread
 import uvicorn
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
@@ -7,8 +8,10 @@ from sqlalchemy import text
 from sqlalchemy.orm import Session
 from dotenv import load_dotenv
 
-from database import Base, engine
+from database import Base, engine, DB_POOL_SIZE, DB_MAX_OVERFLOW
 from deps import get_db
+from auth import start_jwks_refresh, stop_jwks_refresh
+from apis.openpecha import close_client as close_openpecha_client
 from routers import (
     users,
     texts,
@@ -65,6 +68,26 @@ app.include_router(annotation_list.router, prefix="/v1")
 app.include_router(openpech.router, prefix="/v1")
 
 
+# Worker threads for sync endpoints (anyio defaults to 40). Sized to the DB
+# pool so requests queue for a thread rather than holding one while blocked
+# waiting for a connection.
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", str(DB_POOL_SIZE + DB_MAX_OVERFLOW)))
+
+
+@app.on_event("startup")
+async def startup_event():
+    """Size the threadpool and warm the Auth0 JWKS cache so no request pays for the first fetch."""
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    await start_jwks_refresh()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background refreshes and release pooled HTTP connections."""
+    await stop_jwks_refresh()
+    await close_openpecha_client()
+
+
 @app.get("/")
 def read_root():
     """Root endpoint with API information."""
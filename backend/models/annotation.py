@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Enum
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Enum, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from database import Base
@@ -11,9 +11,9 @@ class Annotation(Base):
     __tablename__ = "annotations"
 
     id = Column(Integer, primary_key=True, index=True)
-    text_id = Column(Integer, ForeignKey("texts.id", ondelete="CASCADE"), nullable=False, index=True)
-    annotator_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)  # Allow null for system annotations
-    annotation_type = Column(String, nullable=False, index=True)  # e.g., "entity", "sentiment", "category"
+    text_id = Column(Integer, ForeignKey("texts.id", ondelete="CASCADE"), nullable=False)
+    annotator_id = Column(Integer, ForeignKey("users.id"), nullable=True)  # Allow null for system annotations
+    annotation_type = Column(String, nullable=False)  # e.g., "entity", "sentiment", "category"
     start_position = Column(Integer, nullable=False)  # Start character position in text
     end_position = Column(Integer, nullable=False)    # End character position in text
     selected_text = Column(String, nullable=True)     # The actual text that was annotated
@@ -28,4 +28,12 @@ class Annotation(Base):
     # Relationships
     text = relationship("Text", back_populates="annotations")
     annotator = relationship("User", back_populates="annotations")
-    reviews = relationship("AnnotationReview", back_populates="annotation", cascade="all, delete-orphan") 
\ No newline at end of file
+    reviews = relationship("AnnotationReview", back_populates="annotation", cascade="all, delete-orphan") 
+
+    # Composite indexes for filtered, id-ordered pagination; they also serve
+    # plain lookups on text_id, annotator_id and annotation_type
+    __table_args__ = (
+        Index("ix_annotations_text_id_id", "text_id", "id"),
+        Index("ix_annotations_annotator_id_id", "annotator_id", "id"),
+        Index("ix_annotations_annotation_type_id", "annotation_type", "id"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, UniqueConstraint
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, UniqueConstraint, Index, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from database import Base
@@ -22,4 +22,10 @@ class AnnotationReview(Base):
     # Ensure a reviewer can only review an annotation once
     __table_args__ = (
         UniqueConstraint('annotation_id', 'reviewer_id', name='unique_annotation_reviewer'),
+        # Serves the is_agreed EXISTS in annotation listings
+        Index(
+            "ix_annotation_reviews_agreed",
+            "annotation_id",
+            postgresql_where=text("decision = 'agree'"),
+        ),
     ) 
\ No newline at end of file
@@ -14,6 +14,8 @@ PROGRESS = "progress"
 
 # List of all valid statuses for validation
 VALID_STATUSES = [INITIALIZED, ANNOTATED, REVIEWED, REVIEWED_NEEDS_REVISION, SKIPPED, PROGRESS]
+# Same statuses for membership checks
+VALID_STATUSES_SET = frozenset(VALID_STATUSES)
 
 
 class Text(Base):
@@ -26,6 +26,9 @@ class User(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    # Fetch server defaults (created_at) with INSERT ... RETURNING
+    __mapper_args__ = {"eager_defaults": True}
+
     # Relationships
     annotations = relationship("Annotation", back_populates="annotator")
     reviewed_texts = relationship("Text", back_populates="reviewer", foreign_keys="[Text.reviewer_id]")
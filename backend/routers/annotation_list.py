@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends, File, UploadFile
 from sqlalchemy.orm import Session
 
 from deps import get_db
-from auth import get_current_active_user
+from auth import get_current_active_user, require_admin
 from models.user import User
 from schemas.annotation_list import (
     AnnotationListResponse,
@@ -25,7 +25,7 @@ router = APIRouter(prefix="/annotation-lists", tags=["Annotation Lists"])
 async def upload_annotation_list_file(
     file: UploadFile = File(..., description="JSON file with hierarchical annotation list"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: User = Depends(require_admin),
 ):
     """Upload a JSON file with hierarchical annotation list. Admin only."""
     content = await file.read()
@@ -62,7 +62,7 @@ def get_annotation_lists_by_type_hierarchical(
 def delete_annotation_lists_by_type(
     type_id: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: User = Depends(require_admin),
 ):
     """Delete all annotation lists of a specific type. Admin only."""
     return annotation_list_controller.delete_annotation_lists_by_type(
@@ -74,7 +74,7 @@ def delete_annotation_lists_by_type(
 def create_annotation_list_item(
     item_in: AnnotationListCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: User = Depends(require_admin),
 ):
     """Create a new annotation list item. Admin only."""
     return annotation_list_controller.create_annotation_list_item(
@@ -87,7 +87,7 @@ def update_annotation_list_item(
     item_id: str,
     item_in: AnnotationListUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: User = Depends(require_admin),
 ):
     """Update an annotation list item. Admin only."""
     return annotation_list_controller.update_annotation_list_item(
@@ -99,7 +99,7 @@ def update_annotation_list_item(
 def delete_annotation_list_item(
     item_id: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: User = Depends(require_admin),
 ):
     """Delete an annotation list item. Admin only."""
     return annotation_list_controller.delete_annotation_list_item(
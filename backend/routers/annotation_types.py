@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
 from deps import get_db
-from auth import get_current_active_user
+from auth import get_current_active_user, require_admin
 from models.user import User
 from schemas.annotation_type import (
     AnnotationTypeResponse,
@@ -23,7 +23,7 @@ router = APIRouter(prefix="/annotation-types", tags=["Annotation Types"])
 def create_annotation_type(
     annotation_type_in: AnnotationTypeCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: User = Depends(require_admin),
 ):
     """Create a new annotation type. Only admins can create."""
     return annotation_types_controller.create_annotation_type(
@@ -73,7 +73,7 @@ def update_annotation_type(
     type_id: str,
     annotation_type_in: AnnotationTypeUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: User = Depends(require_admin),
 ):
     """Update an annotation type. Only admins can update."""
     return annotation_types_controller.update_annotation_type(
@@ -85,7 +85,7 @@ def update_annotation_type(
 def delete_annotation_type(
     type_id: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: User = Depends(require_admin),
 ):
     """Delete an annotation type. Only admins can delete. Cascades to annotation lists."""
     return annotation_types_controller.delete_annotation_type(
@@ -27,6 +27,7 @@ def read_annotations(
     text_id: Optional[int] = Query(None),
     annotator_id: Optional[int] = Query(None),
     annotation_type: Optional[str] = Query(None),
+    after_id: Optional[int] = Query(None, ge=0, description="Return annotations with id greater than this (keyset pagination)"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
@@ -39,6 +40,7 @@ def read_annotations(
         text_id=text_id,
         annotator_id=annotator_id,
         annotation_type=annotation_type,
+        after_id=after_id,
     )
 
 
@@ -58,12 +60,13 @@ def create_annotation(
 def read_my_annotations(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    after_id: Optional[int] = Query(None, ge=0, description="Return annotations with id greater than this (keyset pagination)"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
     """Get current user's annotations."""
     return annotations_controller.read_my_annotations(
-        db, current_user, skip=skip, limit=limit
+        db, current_user, skip=skip, limit=limit, after_id=after_id
     )
 
 
@@ -84,12 +87,13 @@ def read_annotations_by_type(
     annotation_type: str,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    after_id: Optional[int] = Query(None, ge=0, description="Return annotations with id greater than this (keyset pagination)"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
     """Get annotations by type."""
     return annotations_controller.read_annotations_by_type(
-        db, current_user, annotation_type, skip=skip, limit=limit
+        db, current_user, annotation_type, skip=skip, limit=limit, after_id=after_id
     )
 
 
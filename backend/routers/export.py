@@ -36,10 +36,13 @@ def export_data(
     filter_type: str = Query(
         "annotated", description="Filter type: 'reviewed' or 'annotated'"
     ),
+    compress: bool = Query(
+        False, description="Deflate the JSON files (smaller download, more CPU)"
+    ),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_admin),
 ):
     """Export texts and annotations as a ZIP file. Admin only."""
     return export_controller.export_data(
-        db, current_user, from_date, to_date, filter_type
+        db, current_user, from_date, to_date, filter_type, compress
     )
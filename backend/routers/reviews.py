@@ -3,6 +3,7 @@
 from typing import List
 
 from fastapi import APIRouter, Depends
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 
 from deps import get_db
@@ -22,7 +23,7 @@ from controllers import reviews as reviews_controller
 router = APIRouter(prefix="/reviews", tags=["Reviews"])
 
 
-@router.get("/texts-for-review", response_model=List[dict])
+@router.get("/texts-for-review", response_model=List[dict], response_class=ORJSONResponse)
 def get_texts_for_review(
     skip: int = 0,
     limit: int = 100,
@@ -35,7 +36,7 @@ def get_texts_for_review(
     )
 
 
-@router.get("/my-review-progress", response_model=List[dict])
+@router.get("/my-review-progress", response_model=List[dict], response_class=ORJSONResponse)
 def get_my_review_progress(
     skip: int = 0,
     limit: int = 100,
@@ -135,7 +136,7 @@ def delete_review(
     return reviews_controller.delete_review(db, current_user, review_id)
 
 
-@router.get("/annotator/reviewed-work", response_model=List[dict])
+@router.get("/annotator/reviewed-work", response_model=List[dict], response_class=ORJSONResponse)
 def get_annotator_reviewed_work(
     skip: int = 0,
     limit: int = 100,
@@ -148,7 +149,7 @@ def get_annotator_reviewed_work(
     )
 
 
-@router.get("/annotator/texts-need-revision", response_model=List[dict])
+@router.get("/annotator/texts-need-revision", response_model=List[dict], response_class=ORJSONResponse)
 def get_texts_needing_revision(
     skip: int = 0,
     limit: int = 100,
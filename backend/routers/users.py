@@ -65,12 +65,13 @@ def read_users(
     limit: int = Query(100, ge=1, le=1000),
     is_active: Optional[bool] = Query(None),
     role: Optional[UserRole] = Query(None),
+    after_id: Optional[int] = Query(None, ge=0, description="Return users with id greater than this (keyset pagination)"),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_admin),
 ):
     """Get users list (Admin only)."""
     return users_controller.list_users(
-        db, current_user, skip=skip, limit=limit, is_active=is_active, role=role
+        db, current_user, skip=skip, limit=limit, is_active=is_active, role=role, after_id=after_id
     )
 
 
@@ -110,8 +111,9 @@ def search_users(
     q: str = Query(..., min_length=1),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    after_id: Optional[int] = Query(None, ge=0, description="Return users with id greater than this (keyset pagination)"),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_admin),
 ):
     """Search users (Admin only)."""
-    return users_controller.search_users(db, current_user, q, skip=skip, limit=limit)
+    return users_controller.search_users(db, current_user, q, skip=skip, limit=limit, after_id=after_id)
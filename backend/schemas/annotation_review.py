@@ -1,4 +1,4 @@
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, validator
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
@@ -32,6 +32,12 @@ class ReviewDecision(BaseModel):
     decision: str = Field(..., description="Review decision: 'agree' or 'disagree'")
     comment: Optional[str] = Field(None, description="Optional comment from reviewer")
 
+    @validator('decision')
+    def validate_decision(cls, v):
+        if v not in ("agree", "disagree"):
+            raise ValueError("Decision must be 'agree' or 'disagree'")
+        return v
+
 
 class ReviewSubmission(BaseModel):
     text_id: int
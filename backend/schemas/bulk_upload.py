@@ -75,13 +75,11 @@ class BulkUploadFileData(BaseModel):
                 if annotation.end_position > text_length:
                     raise ValueError(f'Annotation {idx}: end_position ({annotation.end_position}) exceeds text length ({text_length})')
                 
-                # Extract selected text if not provided
-                if not annotation.selected_text:
-                    annotation.selected_text = text_content[annotation.start_position:annotation.end_position]
-                
-                # Validate selected text matches positions
+                # Extract selected text if not provided, otherwise validate it matches positions
                 expected_text = text_content[annotation.start_position:annotation.end_position]
-                if annotation.selected_text != expected_text:
+                if not annotation.selected_text:
+                    annotation.selected_text = expected_text
+                elif annotation.selected_text != expected_text:
                     raise ValueError(f'Annotation {idx}: selected_text does not match text at specified positions')
         
         return v
@@ -1,7 +1,7 @@
 from pydantic import BaseModel, ConfigDict, Field, validator
 from typing import Optional
 from datetime import datetime
-from models.text import VALID_STATUSES
+from models.text import VALID_STATUSES, VALID_STATUSES_SET
 
 
 class UserBasic(BaseModel):
@@ -60,7 +60,7 @@ class TextUpdate(BaseModel):
 
     @validator('status')
     def validate_status(cls, v):
-        if v is not None and v not in VALID_STATUSES:
+        if v is not None and v not in VALID_STATUSES_SET:
             raise ValueError(f'Status must be one of: {", ".join(VALID_STATUSES)}')
         return v
 
@@ -91,7 +91,7 @@ class TextResponse(TextBase):
     
     @validator('status')
     def validate_status(cls, v):
-        if v not in VALID_STATUSES:
+        if v not in VALID_STATUSES_SET:
             raise ValueError(f'Status must be one of: {", ".join(VALID_STATUSES)}')
         return v
 
@@ -122,7 +122,7 @@ class TextListResponse(BaseModel):
     
     @validator('status')
     def validate_status(cls, v):
-        if v not in VALID_STATUSES:
+        if v not in VALID_STATUSES_SET:
             raise ValueError(f'Status must be one of: {", ".join(VALID_STATUSES)}')
         return v
 
@@ -0,0 +1,40 @@
+"""In-process cache of dashboard statistics, keyed by a name such as "text_stats".
+
+Statistics change slowly and are polled by every dashboard, so each result is
+served from memory for STATS_CACHE_TTL seconds. Entries are dropped explicitly
+by the writes that most visibly change them (task submission, text creation,
+review submission); anything else shows up once the entry expires.
+"""
+
+import os
+from typing import Any, Dict, Optional
+
+from utils.ttl_cache import TTLCache
+
+STATS_CACHE_TTL = float(os.getenv("STATS_CACHE_TTL", "30"))
+STATS_CACHE_MAX_ENTRIES = 10_000
+
+TEXT_STATS_KEY = "text_stats"
+
+_cache = TTLCache(ttl=STATS_CACHE_TTL, max_entries=STATS_CACHE_MAX_ENTRIES)
+
+
+def reviewer_stats_key(reviewer_id: int) -> str:
+    """Cache key for a reviewer's statistics."""
+    return f"reviewer_stats:{reviewer_id}"
+
+
+def get_cached_stats(key: str) -> Optional[Dict[str, Any]]:
+    """Return the cached statistics, or None on miss/expiry."""
+    stats = _cache.get(key)
+    return dict(stats) if stats is not None else None
+
+
+def cache_stats(key: str, stats: Dict[str, Any]) -> None:
+    """Store statistics under the key."""
+    _cache.set(key, dict(stats))
+
+
+def invalidate_stats(*keys: str) -> None:
+    """Drop the cached entries for the keys, if any."""
+    _cache.invalidate(*keys)
@@ -0,0 +1,48 @@
+"""Bounded in-process cache whose entries expire after a TTL.
+
+The single implementation of expiry, eviction and locking behind the
+per-process caches. Safe to use from the threadpool.
+"""
+
+import threading
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """Thread-safe dict of key -> value that expires entries and evicts the oldest when full."""
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None on miss/expiry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store the value for ttl seconds (capped at the cache's TTL); a TTL <= 0 stores nothing."""
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+        with self._lock:
+            if key not in self._entries and len(self._entries) >= self.max_entries:
+                # Evict the oldest entry; dicts preserve insertion order
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (time.monotonic() + ttl, value)
+
+    def invalidate(self, *keys: Hashable) -> None:
+        """Drop the entries for the keys, if any."""
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
@@ -0,0 +1,35 @@
+"""In-process cache of authenticated users, keyed by Auth0 user ID.
+
+Stores a snapshot of the user's column values so authenticate() can attach the
+current user to the request session without a SELECT on every request.
+Entries expire after USER_CACHE_TTL seconds and are dropped explicitly whenever
+a user row is updated or deleted through crud.user.
+"""
+
+import os
+from typing import Any, Dict, Optional
+
+from utils.ttl_cache import TTLCache
+
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "60"))
+USER_CACHE_MAX_ENTRIES = 10_000
+
+_cache = TTLCache(ttl=USER_CACHE_TTL, max_entries=USER_CACHE_MAX_ENTRIES)
+
+
+def get_cached_user(auth0_user_id: str) -> Optional[Dict[str, Any]]:
+    """Return cached column values for the user, or None on miss/expiry."""
+    values = _cache.get(auth0_user_id)
+    return dict(values) if values is not None else None
+
+
+def cache_user(auth0_user_id: str, values: Dict[str, Any]) -> None:
+    """Store column values for the user."""
+    _cache.set(auth0_user_id, dict(values))
+
+
+def invalidate_user(auth0_user_id: Optional[str]) -> None:
+    """Drop the cached entry for the user, if any."""
+    if not auth0_user_id:
+        return
+    _cache.invalidate(auth0_user_id)